@@ -1,90 +1,272 @@
+# ----------------------------------------------------
+# BETS – top edge per game & market (odds under $3) from the Export workbooks
+#
+#   python Bets.py                                        # -> top_edges_per_game.csv
+#   python Bets.py "rounds/*/Export*.xlsx" --markets AGS 15+ --format ndjson --out -
+#   python Bets.py "rounds/*/Export*.xlsx" --format parquet --out top_edges/ --workers 4
+#
+# Each workbook is parsed once (round_data's versioned cache, so a re-run or
+# the dashboard on the same host reuses it). Its sheets are then separate
+# jobs, queued in game order, and a game is written out as soon as its own
+# sheets are done – consumers start on the first games while the rest of the
+# round is still going.
+# NDJSON / Parquet are long and typed – one record per (round, game, market):
+#   Round int, Game str, Market str, Player str, Edge float32 (fraction), Odds float32
+# (NDJSON rounds them to 4 / 2 decimals so the float32 noise doesn't show)
+# NDJSON is one file, flushed per game; Parquet is one file per game in the
+# --out directory (renamed into place when complete). CSV keeps the old wide
+# one-row-per-game layout and is written once everything is in.
+# ----------------------------------------------------
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import pandas as pd
 
-# Define files
-goals_file = 'Export.xlsx'
-disposals_file = 'ExportDisposals.xlsx'
-
-# Define market rows and columns
-goal_markets = {
-    'AGS': (3, 8, 'AGS Odds'),
-    '2+': (10, 15, '2+ Odds'),
-    '3+': (17, 22, '3+ Odds')
-}
-
-disposal_markets = {
-    '15+': (3, 8, '15+ Odds'),
-    '20+': (10, 15, '20+ Odds'),
-    '25+': (17, 22, '25+ Odds')
-}
-
-# Load sheet names
-goals_xls = pd.ExcelFile(goals_file)
-disposals_xls = pd.ExcelFile(disposals_file)
-
-# Collect results
-output = []
-
-for sheet in goals_xls.sheet_names:
-    row = {'Game': sheet}
-    df_goal = pd.read_excel(goals_xls, sheet_name=sheet, header=None)
-
-    # Process goal markets
-    for market, (start, end, colname) in goal_markets.items():
-        home_df = df_goal.iloc[start:end, 1:5].copy()
-        away_df = df_goal.iloc[start:end, 8:12].copy()
-        home_df.columns = away_df.columns = ['Player', 'Edge', colname, 'VS']
-        combined = pd.concat([home_df, away_df])
-        combined = combined.dropna(subset=['Edge', colname])
-        combined[colname] = pd.to_numeric(combined[colname], errors='coerce')
-        combined = combined[combined[colname] < 3]
-        if not combined.empty:
-            top_idx = combined['Edge'].idxmax()
-            top_player = combined.loc[[top_idx], 'Player'].values[0]
-            top_edge = combined.loc[[top_idx], 'Edge'].values[0]
-            top_odds = combined.loc[[top_idx], colname].values[0]
-
-            row[f'{market}_Player'] = str(top_player)
-            row[f'{market}_Edge'] = round(float(top_edge), 3)
-            row[f'{market}_Odds'] = round(float(top_odds), 2)
-        else:
-            row[f'{market}_Player'] = None
-            row[f'{market}_Edge'] = None
-            row[f'{market}_Odds'] = None
-
-    # Process disposal markets
-    if sheet in disposals_xls.sheet_names:
-        df_disp = pd.read_excel(disposals_xls, sheet_name=sheet, header=None)
-        for market, (start, end, colname) in disposal_markets.items():
-            home_df = df_disp.iloc[start:end, 1:5].copy()
-            away_df = df_disp.iloc[start:end, 8:12].copy()
-            home_df.columns = away_df.columns = ['Player', 'Edge', colname, 'VS']
-            combined = pd.concat([home_df, away_df])
-            combined = combined.dropna(subset=['Edge', colname])
-            combined[colname] = pd.to_numeric(combined[colname], errors='coerce')
-            combined = combined[combined[colname] < 3]
-            if not combined.empty:
-                top_idx = combined['Edge'].idxmax()
-                top_player = combined.loc[[top_idx], 'Player'].values[0]
-                top_edge = combined.loc[[top_idx], 'Edge'].values[0]
-                top_odds = combined.loc[[top_idx], colname].values[0]
-
-                row[f'{market}_Player'] = str(top_player)
-                row[f'{market}_Edge'] = round(float(top_edge), 3)
-                row[f'{market}_Odds'] = round(float(top_odds), 2)
-            else:
-                row[f'{market}_Player'] = None
-                row[f'{market}_Edge'] = None
-                row[f'{market}_Odds'] = None
+import round_data
+from market_table import MarketTable
+
+# ————— CONFIG —————
+INPUTS   = ['Export.xlsx', 'ExportDisposals.xlsx']
+OUT_CSV  = 'top_edges_per_game.csv'
+MAX_ODDS = 3.0
+BLOCKS   = [(3, 8), (10, 15), (17, 22)]    # player rows of each market block
+SIDES    = [slice(1, 5), slice(8, 12)]     # home, away: Player, Edge, Odds, VS
+# ——————————————————
+
+
+def round_number(raw):
+    """9 from 'ROUND 9' in A1 (None if the sheet doesn't say)."""
+    m = re.search(r'\d+', str(raw.iat[0, 0])) if not raw.empty else None
+    return int(m.group()) if m else None
+
+
+def scan(path):
+    """[(round, sheet)] for a workbook, without parsing the data."""
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True)
+    try:
+        out = []
+        for ws in wb.worksheets:
+            m = re.search(r'\d+', str(ws['A1'].value or ''))
+            out.append((int(m.group()) if m else None, ws.title))
+        return out
+    finally:
+        wb.close()
+
+
+# ————— Worker —————
+def market_rows(sheets, markets=None):
+    """Every home/away block of every sheet, one frame (market from the block label)."""
+    frames = []
+    for sheet, df in sheets.items():
+        rnd = round_number(df)
+        if df.shape[1] < SIDES[-1].stop:
+            continue                # not the Export layout (e.g. Export_simple)
+        for start, end in BLOCKS:
+            # a block is its label row ('AGS', Players, Edge, Odds, VS) + players
+            if start > len(df) or str(df.iat[start - 1, 1]).strip() != 'Players':
+                continue
+            market = str(df.iat[start - 1, 0]).strip()
+            if markets and market not in markets:
+                continue
+            for cols in SIDES:
+                block = df.iloc[start:end, cols].copy()
+                block.columns = ['Player', 'Edge', 'Odds', 'VS']
+                block.insert(0, 'Market', market)
+                block.insert(0, 'Game', sheet)
+                block.insert(0, 'Round', rnd)
+                frames.append(block)
+    if not frames:
+        return pd.DataFrame(columns=['Round', 'Game', 'Market', 'Player', 'Edge', 'Odds'])
+    return pd.concat(frames, ignore_index=True).dropna(subset=['Edge', 'Odds'])
+
+
+def sheet_best(sheet, raw, markets=None, max_odds=MAX_ODDS):
+    """
+    Worker: ({(round, game): [record, ...]}, markets seen) – the top edge
+    under `max_odds` for each market of one parsed sheet, in block order.
+    """
+    rows = market_rows({sheet: raw}, markets)
+    order = {m: i for i, m in enumerate(dict.fromkeys(rows['Market']))}
+    rounds = dict(zip(rows['Game'], rows['Round']))
+
+    table = MarketTable.from_frame(rows, cats=['Game', 'Market', 'Player'], nums=['Edge', 'Odds'])
+    best = table.take(table.best_by(['Game', 'Market'], 'Edge', mask=table.num('Odds') < max_odds))
+
+    out = {}
+    for g, m, p, e, o in zip(best.cat('Game'), best.cat('Market'), best.cat('Player'),
+                             best.num('Edge'), best.num('Odds')):
+        out.setdefault((rounds[g], g), []).append({
+            'Round': rounds[g], 'Game': g, 'Market': m, 'Player': str(p),
+            # plain floats at the sheet's precision – 0.2315, not float32 noise
+            'Edge': round(float(e), 4), 'Odds': round(float(o), 2),
+        })
+    for recs in out.values():
+        recs.sort(key=lambda r: order[r['Market']])
+    return out, list(order)
+
+
+# ————— Writers —————
+class NdjsonWriter:
+    def __init__(self, out):
+        self.f = sys.stdout if out == '-' else open(out, 'w', encoding='utf-8')
+
+    def write_game(self, key, records):
+        for rec in records:
+            self.f.write(json.dumps(rec, ensure_ascii=False) + '\n')
+        self.f.flush()
+
+    def close(self, markets):
+        if self.f is not sys.stdout:
+            self.f.close()
+
+
+class ParquetWriter:
+    def __init__(self, out):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            sys.exit("❌ Parquet output needs pyarrow (pip install pyarrow)")
+        self.pa, self.pq, self.out = pa, pq, out
+        self.schema = pa.schema([
+            ('Round', pa.int16()), ('Game', pa.string()), ('Market', pa.string()),
+            ('Player', pa.string()), ('Edge', pa.float32()), ('Odds', pa.float32()),
+        ])
+        os.makedirs(out, exist_ok=True)
+
+    def write_game(self, key, records):
+        if not records:
+            return
+        rnd, game = key
+        slug = re.sub(r'[^a-z0-9]+', '-', game.lower()).strip('-')
+        fn = os.path.join(self.out, f"R{rnd if rnd is not None else 'x'}-{slug}.parquet")
+        table = self.pa.Table.from_pylist(records, schema=self.schema)
+        # readers globbing *.parquet never see a half-written file
+        self.pq.write_table(table, fn + '.tmp')
+        os.replace(fn + '.tmp', fn)
+
+    def close(self, markets):
+        pass
+
+
+class CsvWriter:
+    """The original wide layout: Game, then <market>_Player/_Edge/_Odds per market."""
+    def __init__(self, out, games):
+        self.out = out
+        self.rows = dict.fromkeys(games)    # keeps workbook order
+
+    def write_game(self, key, records):
+        self.rows[key] = {r['Market']: r for r in records}
+
+    def close(self, markets):
+        output = []
+        for (rnd, game), best in self.rows.items():
+            if best is None:
+                continue
+            row = {'Game': game}
+            for market in markets:
+                hit = best.get(market)
+                row[f'{market}_Player'] = hit['Player'] if hit else None
+                row[f'{market}_Edge'] = round(hit['Edge'], 3) if hit else None
+                row[f'{market}_Odds'] = round(hit['Odds'], 2) if hit else None
+            output.append(row)
+        pd.DataFrame(output).to_csv(self.out, index=False)
+
+
+# ————— Run —————
+def expand(patterns):
+    paths = []
+    for pat in patterns:
+        hits = sorted(glob.glob(pat)) or ([pat] if os.path.exists(pat) else [])
+        if not hits:
+            sys.exit(f"❌ No workbooks match '{pat}'")
+        paths += [p for p in hits if p not in paths]
+    return paths
+
+
+def run(paths, writer_for, *, markets=None, workers=None, max_odds=MAX_ODDS):
+    """
+    Parse each workbook once (in parallel), run its sheets as separate jobs,
+    and hand each game to the writer as soon as its own sheets are in.
+    Returns the number of games written.
+    """
+    # which sheets each game is waiting on, games in workbook order
+    pending, games, sheets = {}, [], {}
+    for path in paths:
+        sheets[path] = scan(path)
+        for key in sheets[path]:
+            if key not in pending:
+                games.append(key)
+            pending.setdefault(key, []).append(path)
+
+    writer = writer_for(games)
+    buffered, seen, written = {}, {}, 0
+
+    def flush(key, path, out, found):
+        nonlocal written
+        seen[(path, key)] = found
+        for k, recs in out.items():
+            buffered.setdefault(k, {})[path] = recs
+        pending[key].remove(path)
+        # sheets with nothing under the odds cap (or not in the Export
+        # layout) have no records and are skipped
+        if not pending[key] and key in buffered:
+            parts = buffered.pop(key)
+            writer.write_game(key, [r for p in paths for r in parts.get(p, [])])
+            written += 1
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        parses = {pool.submit(round_data.read_workbook, path): path for path in paths}
+        futures = {}
+        for f in as_completed(parses):
+            path = parses[f]
+            parsed = f.result()
+            # sheets go in game order, so the first games finish first
+            for key in sheets[path]:
+                futures[pool.submit(sheet_best, key[1], parsed[key[1]], markets, max_odds)] = (key, path)
+        for f in as_completed(futures):
+            flush(*futures[f], *f.result())
+
+    # market columns in input order (goals then disposals by default), or as asked
+    found = []
+    for path in paths:
+        for key in sheets[path]:
+            found += [m for m in seen.get((path, key), []) if m not in found]
+    writer.close(markets or found)
+    return written
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Top edge per game & market (odds under $3).")
+    ap.add_argument('inputs', nargs='*', default=INPUTS, help="workbooks or globs (default: %(default)s)")
+    ap.add_argument('--markets', nargs='+', help="market labels to keep, e.g. AGS 2+ 15+")
+    ap.add_argument('--format', choices=['csv', 'ndjson', 'parquet'], default='csv')
+    ap.add_argument('--out', help=f"file, '-' for stdout (ndjson), or directory (parquet); "
+                                  f"default {OUT_CSV} / top_edges.ndjson / top_edges/")
+    ap.add_argument('--max-odds', type=float, default=MAX_ODDS)
+    ap.add_argument('--workers', type=int, default=None, help="processes (default: CPU count)")
+    args = ap.parse_args()
+
+    out = args.out or {'csv': OUT_CSV, 'ndjson': 'top_edges.ndjson', 'parquet': 'top_edges'}[args.format]
+    if args.format == 'parquet':
+        writer_for = lambda games: ParquetWriter(out)
+    elif args.format == 'ndjson':
+        writer_for = lambda games: NdjsonWriter(out)
     else:
-        for market in disposal_markets.keys():
-            row[f'{market}_Player'] = None
-            row[f'{market}_Edge'] = None
-            row[f'{market}_Odds'] = None
+        writer_for = lambda games: CsvWriter(out, games)
 
-    output.append(row)
+    n = run(expand(args.inputs), writer_for, markets=args.markets,
+            workers=args.workers, max_odds=args.max_odds)
+    if out != '-':
+        print(f"✅ Top edges for {n} games saved to '{out}'")
 
-# Save output
-output_df = pd.DataFrame(output)
-output_df.to_csv('top_edges_per_game.csv', index=False)
 
-print("✅ Top edges saved to 'top_edges_per_game.csv'")
+if __name__ == '__main__':
+    main()
@@ -2,143 +2,107 @@
 # AFL EDGE DASHBOARD – Streamlit App (With Debugs & Section Numbers)
 # ----------------------------------------------------
 
+import startup_profile
+startup_profile.start("afl_dashboard_app")
+
 import streamlit as st
+import numpy as np
 import pandas as pd
 from datetime import datetime
-import requests
 import streamlit.components.v1 as components
-import os, io, base64
-from PIL import Image
 import base64
+import round_data
+from export_validator import InvalidExport
+from player_index import KEY_COLS, PlayerIndex
+from rendering import make_table_html, style_table, prep
+import memcache
+from memcache import MemoryCache
+# requests (weather) and sgm_pricer (Multis) are imported where they're used –
+# most page views never need them
 
-with open("PC_Logo.png", "rb") as f:
-    b64 = base64.b64encode(f.read()).decode()
+startup_profile.mark("imports")
 
 # ————— Helpers —————
-@st.cache_data
-def load_fixtures():
-    xls = pd.ExcelFile("Export_simple.xlsx")
-    mapping = {}
-    for sheet in xls.sheet_names:
-        df0 = pd.read_excel(xls, sheet_name=sheet, header=None)
-        m = df0.iat[0, 0]             # <-- sheet name lives in A1
-        if isinstance(m, str) and "VS" in m:
-            mapping[m.strip()] = sheet
-    return mapping
-
-
-@st.cache_data
-def load_stats():
-    overall = pd.read_excel("upcoming_round_summary.xlsx", sheet_name="Overall_Last5")
-    venue   = pd.read_excel("upcoming_round_summary.xlsx", sheet_name="Venue_Last5")
-    return overall, venue
+# workbooks are loaded through round_data, which caches them per file version
+# (shared with testing.py, localtesting.py, Bets.py and the API)
+
+# static chrome (logos, badge HTML) is read once per process; the page body
+# is split into fragments (section 9 on) so changing a tab or a filter only
+# reruns that part, not the sidebar, styling and data loading above it
+@st.cache_resource
+def image_bytes(fn):
+    with open(fn, "rb") as f:
+        return f.read()
+
+@st.cache_resource
+def patreon_badge_html():
+    b64 = base64.b64encode(image_bytes("PC_Logo.png")).decode()
+    return f'''
+<div style="text-align:center; margin: 10px 0;">
+  <a href="https://www.patreon.com/The_Model" target="_blank">
+    <img src="data:image/png;base64,{b64}" width="120" alt="Patreon Logo">
+  </a>
+</div>
+        '''
 
+# one lookup per city & day every half hour, shared by every session – not a
+# request on every rerun
+@st.cache_data(ttl=1800, show_spinner=False)
 def get_weather_forecast(city, game_date):
-    try:
-        api_key = st.secrets["openweather_api_key"]
-        url = f"http://api.openweathermap.org/data/2.5/forecast?q={city}&appid={api_key}&units=metric"
-        r = requests.get(url); r.raise_for_status()
-        data = r.json()
-        if "list" not in data:
-            return f"⚠️ Weather data unavailable – {game_date:%B %d} · {city}"
-        for f in data["list"]:
-            if pd.to_datetime(f["dt_txt"]).date() == game_date:
-                temp = f["main"]["temp"]
-                desc = f["weather"][0]["description"]
-                emoji = "☀️" if "clear" in desc else "🌧️" if "rain" in desc else "🌤️"
-                return f"{emoji} {temp:.1f}°C, {desc.capitalize()} – {game_date:%B %d} · {city}"
-        return f"{game_date:%B %d} · {city} (forecast not found)"
-    except:
-        return "⚠️ Weather fetch failed"
-
-def img_to_b64(img):
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    return base64.b64encode(buf.getvalue()).decode()
-
-def load_logo_b64(team):
-    for ext in (".png", ".jpg", ".jpeg"):
-        fn = f"{team}{ext}"
-        if os.path.exists(fn):
-            return img_to_b64(Image.open(fn).resize((30,30)))
-    return None
-
-def make_table_html(df, *, add_divider=False, date_fmt="%d %b", headers=None):
-    V = "1px solid rgba(0,0,0,0.2)"
-    H = "1px solid rgba(0,0,0,0.2)"
-    divider_css = f"border-right:{V};" if add_divider else ""
-    # add font‐family and size to match pandas tables:
-    html = f'<table style="width:100%;border-collapse:collapse;font-family:inherit;font-size:14px;{divider_css}">'
-
-    span = f"border-top:{H};border-bottom:{H};border-left:{V};border-right:{V};padding:4px;vertical-align:middle"
-    top  = f"border-top:{H};border-left:{V};border-right:{V};border-bottom:none;padding:4px;text-align:center"
-    bot  = f"border-left:{V};border-right:{V};border-top:none;border-bottom:{H};padding:4px;text-align:center"
-
-    if headers:
-        # give your <th> the same background & boldness as pandas header cells
-        header_span = span + ";background-color:#F0F4FF;font-weight:bold"
-        html += "<thead><tr>"
-        for h in headers:
-            html += f'<th style="{header_span}">{h}</th>'
-        html += "</tr></thead>"
-
-    html += "<tbody>"
-    for _, r in df.iterrows():
-        ha = str(r.get("HomeAway","")).lower()
-        prefix = "<strong>VS</strong>&nbsp;" if ha=="home" else "<strong>@</strong>&nbsp;"
-        d = pd.to_datetime(r["GameDate"]).strftime(date_fmt)
-
-        html += "<tr>"
-        html += f'<td rowspan="2" style="{span}">{d}</td>'
-
-        b64 = load_logo_b64(r["Opponent"])
-        if b64:
-            html += (
-                f'<td rowspan="2" style="{span}">'
-                f'{prefix}<img src="data:image/png;base64,{b64}" width="30" height="30"/>'
-                "</td>"
-            )
-        else:
-            html += f'<td rowspan="2" style="{span}">{prefix}{r["Opponent"]}</td>'
-
-        html += f'<td style="{top}">{r["Score"]}</td>'
-        html += f'<td style="{top}">{r["Line"]}</td>'
-        html += f'<td style="{top}">{r["O/U"]}</td>'
-        html += "</tr>"
-
-        html += (
-            "<tr>"
-            f'<td style="{bot}">{"✅" if r["Res"]=="W" else "❌"}</td>'
-            f'<td style="{bot}">{"✅" if r["Covered"]=="Y" else "❌"}</td>'
-            f'<td style="{bot}">{"&#9650;" if r["O/U Res"].lower()=="over" else "&#9660;"}</td>'
-            "</tr>"
-        )
-    html += "</tbody></table>"
-    return html
-
-
-def style_table(df, odds_col):
-    def hl(r):
-        # we color by the numeric Edge % value
-        e = float(r["Edge %"].rstrip("%"))
-        color = "#e9f9ec" if e > 0 else "#faeaea"
-        return [f"background-color: {color}"] * len(r)
-
-    return (
-        df.style
-          .format({
-              odds_col:      lambda x: f"${x:.2f}" if pd.notnull(x) else x,
-              "Edge %":      lambda x: f"{x:.1f}%",
-              "Adj Edge %":  lambda x: f"{x:.1f}%"
-          })
-          # ensure the header row here also picks up that same light‐blue + bold style
-          .set_table_styles([
-              {"selector": "th", "props": [("background-color", "#F0F4FF"), ("font-weight","bold")]}
-          ])
-          .apply(hl, axis=1)
+    # raises on a failed fetch so the failure isn't cached for half an hour
+    import requests
+    api_key = st.secrets["openweather_api_key"]
+    url = f"http://api.openweathermap.org/data/2.5/forecast?q={city}&appid={api_key}&units=metric"
+    r = requests.get(url, timeout=10); r.raise_for_status()
+    data = r.json()
+    if "list" not in data:
+        return f"⚠️ Weather data unavailable – {game_date:%B %d} · {city}"
+    for f in data["list"]:
+        if pd.to_datetime(f["dt_txt"]).date() == game_date:
+            temp = f["main"]["temp"]
+            desc = f["weather"][0]["description"]
+            emoji = "☀️" if "clear" in desc else "🌧️" if "rain" in desc else "🌤️"
+            return f"{emoji} {temp:.1f}°C, {desc.capitalize()} – {game_date:%B %d} · {city}"
+    return f"{game_date:%B %d} · {city} (forecast not found)"
+
+@st.cache_resource
+def player_index():
+    # one index for every session; update() only re-indexes changed games
+    return PlayerIndex()
+
+# budgeted caches (memcache) instead of bare st.cache_data – a new round
+# pushes the old one out rather than growing the process until it's killed.
+# Usage report: sidebar with ?admin=1, or the "memcache" logger's INFO lines.
+@st.cache_resource
+def multis_cache():
+    return MemoryCache("multis", max_mb=128)
+
+@st.cache_resource
+def html_cache():
+    return MemoryCache("html", max_mb=16)
+
+def price_game_multis(game, version, legs, max_legs):
+    import sgm_pricer
+    # fixed seed so the ranking doesn't shuffle between reruns
+    return multis_cache().get_or_build(
+        (game, version, max_legs),
+        lambda: sgm_pricer.price_multis(legs, max_legs=max_legs, seed=0)
     )
 
+def team_table_html(stats, view, team, **kw):
+    # same HTML for every visitor – rendered once per stats version
+    key = (view, team, kw.get("add_divider"), kw.get("date_fmt"), stats_version)
+    return html_cache().get_or_build(
+        key, lambda: make_table_html(stats[stats["Team"] == team], **kw)
+    )
 
+def show_invalid(e):
+    # the workbook failed validation – say what's wrong instead of rendering bad data
+    st.error(f"❌ {e.report['workbook']} failed validation ({e.report['errors']} errors) – "
+             "fix the export and re-save it; the page reloads it automatically.")
+    issues = pd.DataFrame(e.report["issues"])
+    st.dataframe(issues[issues["severity"] == "error"][["sheet", "market", "row", "column", "value", "message"]],
+                 hide_index=True)
 
 # ----------------------------------------------------
 # 1. Page Setup
@@ -162,69 +126,61 @@ st.markdown("""
 
 # ----------------------------------------------------
 # 3. Load Fixtures & Stats
-fixtures = load_fixtures()
-overall, venue = load_stats()
+try:
+    stats_version = round_data.data_version("upcoming_round_summary.xlsx")
+    overall, venue = round_data.load_stats("upcoming_round_summary.xlsx")
+except InvalidExport as e:
+    show_invalid(e)
+    st.stop()
 
 # ----------------------------------------------------
 # 4. Load Game Info (from Export_simple.xlsx)
 try:
-    xls = pd.ExcelFile("Export_simple.xlsx")
-    sheet_names = xls.sheet_names
+    round_version = round_data.data_version("Export_simple.xlsx")
+    game_info_mapping = round_data.load_game_info("Export_simple.xlsx")
+    # the compact table is what every view slices – from a snapshot it's the
+    # mapped arrays themselves, shared by every replica on the host
+    round_table = round_data.load_market_table("Export_simple.xlsx")
+except InvalidExport as e:
+    show_invalid(e)
+    st.stop()
 except Exception as e:
     st.error(f"❌ Failed to load Export_simple.xlsx: {e}")
     st.stop()
 
-game_name_mapping = {}
-game_info_mapping = {}
-
-for sheet in sheet_names:
-    df0 = pd.read_excel(xls, sheet_name=sheet, header=None)
-    try:
-        m  = df0.iat[0, 0]     # sheet name at A1
-        d  = df0.iat[1, 0]     # date at A2
-        ct = df0.iat[1, 1]     # city at B2
-        if isinstance(m, str) and "VS" in m:
-            gm = m.strip()
-            game_name_mapping[gm] = sheet
-            home, away = [x.strip() for x in gm.split("VS")]
-
-            game_info_mapping[gm] = {
-    "round": 24,
-    "home": home,
-    "away": away,
-    "date": pd.to_datetime(d).date() if pd.notnull(d) else None,
-    # always display whatever is in the Excel cell (e.g. “Marvel”)
-    "city": str(ct).strip(),
-    # but if that cell says “Marvel”, force the weather lookup to Melbourne,AU
-    "weather_city": (
-        "Melbourne,AU" 
-        if str(ct).lower() == "marvel" 
-        else f"{str(ct).strip()},AU"
-    )
-}
-
-    except Exception as e:
-        st.warning(f"⚠️ Error processing sheet '{sheet}': {e}")
+game_name_mapping = {gm: info["sheet"] for gm, info in game_info_mapping.items()}
+startup_profile.mark("data")
 
 
 # ----------------------------------------------------
 # 5. Sidebar
 with st.sidebar:
-    st.image("logo.png", use_container_width=True)
-    selected_game = st.selectbox("Select a game", list(game_name_mapping.keys()))
+    st.image(image_bytes("logo.png"), use_container_width=True)
+
+    # player search – jumps the game picker to wherever the player is
+    index = player_index()
+    if index.version != round_version:
+        index.update(round_table.to_frame(KEY_COLS), round_version)
+
+    found_player = None
+    query = st.text_input("🔎 Find a player", placeholder="e.g. Cripps")
+    if query:
+        matches = index.search(query)
+        if matches:
+            found_player = st.selectbox("Player", matches)
+            games = [g for g, *_ in index.entries(found_player)]
+            if st.session_state.get("jumped_to") != found_player:
+                st.session_state["jumped_to"] = found_player
+                if games and st.session_state.get("game") not in games:
+                    st.session_state["game"] = games[0]
+        else:
+            st.caption("No players found.")
+
+    selected_game = st.selectbox("Select a game", list(game_name_mapping.keys()), key="game")
     st.markdown("---")
     st.markdown("🎯 **Support The Model**")
     # ←── Insert PC_Logo.png as a Patreon link
-    st.markdown(
-        f'''
-<div style="text-align:center; margin: 10px 0;">
-  <a href="https://www.patreon.com/The_Model" target="_blank">
-    <img src="data:image/png;base64,{b64}" width="120" alt="Patreon Logo">
-  </a>
-</div>
-        ''',
-        unsafe_allow_html=True
-    )
+    st.markdown(patreon_badge_html(), unsafe_allow_html=True)
 
 
     st.markdown("💖 [Join The Model Punt Club](https://www.patreon.com/The_Model)")
@@ -238,31 +194,32 @@ with st.sidebar:
         height=130, scrolling=False
     )
 
+    if st.query_params.get("admin") == "1":
+        with st.expander("🧠 Cache usage"):
+            st.dataframe(pd.DataFrame(memcache.report()), hide_index=True)
+
 # ----------------------------------------------------
-# 6. Load Selected Game from Export_simple.xlsx
+# 6. Selected Game's market blocks
 # ----------------------------------------------------
 sheet_name = game_name_mapping[selected_game]
 game_info  = game_info_mapping[selected_game]
 
-# read the entire sheet, no header
-raw = pd.read_excel("Export_simple.xlsx", sheet_name=sheet_name, header=None)
+# this game's rows – a zero-copy slice of the shared round table, so no
+# per-process copy of the round (nothing parsed at all from a snapshot).
+# Only the 5-row blocks are turned into frames, right where they're shown.
+game_rows = round_table.game(selected_game)
+BLOCK_COLS = [c if c != "BookieOdds" else "Odds" for c in round_data.COLUMNS]
 
-# helper to pull out each 5-row block for home & away
+# helper to pull out each 5-row block for home & away, in the sheet's layout
 def parse_block(label):
-    # find the two occurrences of the block label
-    idxs = list(raw.index[ raw[0]==label ])
-    if len(idxs)!=2:
+    rows = game_rows.eq("Market", label)
+    df_home = game_rows.take(rows & game_rows.eq("Side", "home")).to_frame(BLOCK_COLS)
+    df_away = game_rows.take(rows & game_rows.eq("Side", "away")).to_frame(BLOCK_COLS)
+    if df_home.empty or df_away.empty:
         st.error(f"Couldn’t find two '{label}' blocks in {sheet_name}")
         return pd.DataFrame(), pd.DataFrame()
-    home_i, away_i = idxs
-    # header row is 1 row below label
-    header = list(raw.iloc[home_i+1].values)
-    # data is the next 5 rows
-    df_home = raw.iloc[home_i+2:home_i+7, :len(header)].copy()
-    df_away = raw.iloc[away_i+2:away_i+7, :len(header)].copy()
-    df_home.columns = header
-    df_away.columns = header
-    return df_home, df_away
+    cols = {"Odds": "BookieOdds"}
+    return df_home.rename(columns=cols), df_away.rename(columns=cols)
 
 # 7. pull in all markets
 home_ags,     away_ags     = parse_block("Anytime Goalscorer")
@@ -273,183 +230,257 @@ home_20,     away_20      = parse_block("20+ Disposals")
 home_25,     away_25      = parse_block("25+ Disposals")
 home_30,     away_30      = parse_block("30+ Disposals")
 
-# ─── 8. Table Styling ──────────────────────────────────────────────────────────
-def style_table(df, odds_col):
-    def hl(r):
-        # r["Edge %"] is already a float, so just use it directly
-        e = r["Edge %"]
-        color = "#e9f9ec" if e > 0 else "#faeaea"
-        return [f"background-color: {color}"] * len(r)
-
-    return (
-        df.style
-          .format({
-              odds_col:     lambda x: f"${x:.2f}" if pd.notnull(x) else x,
-              "Edge %":     lambda x: f"{x:.1f}%",
-              "Adj Edge %": lambda x: f"{x:.1f}%"
-          })
-          .set_table_styles([
-              {"selector": "th", "props": [("background-color", "#F0F4FF"), ("font-weight","bold")]}
-          ])
-          .apply(hl, axis=1)
-    )
-def prep(df):
-    """
-    Rename BookieOdds→Odds, pick just the four columns, and
-    hand off to style_table for colouring & formatting.
-    """
-    df2 = (
-        df
-        .rename(columns={"BookieOdds": "Odds"})
-        [["Player", "Odds", "Edge %", "Adj Edge %"]]
-    )
-    return style_table(df2, odds_col="Odds")
-
-
 # ----------------------------------------------------
 # 9. Dashboard Layout
-st.title("AFL Dashboard")
-dashboard_tab = st.radio("Select dashboard",
-                        ["Goalscorer", "Disposals", "Teams"],
-                        horizontal=True)
-st.markdown(f"### **Round {game_info['round']}: "
-            f"{game_info['home']} VS {game_info['away']}**")
-
-# ----------------------------------------------------
-# Weather Display
-venue_disp = ("Melbourne (Marvel Stadium)" 
-              if game_info["city"].lower()=="marvel"
-              else game_info["city"])
-if (game_info["date"] - datetime.today().date()).days <= 5:
-    st.markdown(get_weather_forecast(game_info["weather_city"], game_info["date"]))
-else:
-    st.markdown(f"{game_info['date']:%B %d} · {venue_disp} (too far ahead)")
-st.markdown("---")
-
-# ─── 10. Goalscorer – show Odds, Edge % and Adj Edge % ────────────────────
-if dashboard_tab == "Goalscorer":
-    for label, hdf, adf in [
-        ("Anytime Goalscorer", home_ags, away_ags),
-        ("2+ Goalscorer",      home_2plus, away_2plus),
-        ("3+ Goalscorer",      home_3plus, away_3plus),
-    ]:
-        st.subheader(label)
-        c1, c2 = st.columns(2)
-
-        with c1:
-            st.caption(game_info["home"])
-            st.dataframe(
-                prep(hdf),
-                height=218,
-                use_container_width=True,
-                hide_index=True
-            )
+# The tab picker and everything under it is a fragment: switching tabs
+# reruns just this, not the sidebar and data loading above. Picking a game
+# or searching a player (sidebar) is still a full rerun.
+@st.fragment
+def dashboard():
+    st.title("AFL Dashboard")
+    dashboard_tab = st.radio("Select dashboard",
+                            ["Goalscorer", "Disposals", "Teams", "Multis", "Best of Round"],
+                            horizontal=True)
+
+    if dashboard_tab == "Best of Round":
+        best_of_round()
+        return
+
+    st.markdown(f"### **Round {game_info['round']}: "
+                f"{game_info['home']} VS {game_info['away']}**")
+
+    # ----------------------------------------------------
+    # Weather Display
+    venue_disp = ("Melbourne (Marvel Stadium)" 
+                  if game_info["city"].lower()=="marvel"
+                  else game_info["city"])
+    if game_info["date"] is None:
+        st.markdown(venue_disp)          # the sheet has no date (A2)
+    elif (game_info["date"] - datetime.today().date()).days <= 5:
+        try:
+            st.markdown(get_weather_forecast(game_info["weather_city"], game_info["date"]))
+        except Exception:
+            st.markdown("⚠️ Weather fetch failed")
+    else:
+        st.markdown(f"{game_info['date']:%B %d} · {venue_disp} (too far ahead)")
+    st.markdown("---")
 
-        with c2:
-            st.caption(game_info["away"])
+    # ----------------------------------------------------
+    # Player search result – every market the player is in for this game
+    if found_player:
+        game_table = round_table.game(selected_game)
+        # by normalised name – another game's sheet may spell the player differently
+        player_rows = game_table.take(game_table.isin("Player", index.spellings(found_player))).to_frame()
+        if not player_rows.empty:
+            st.subheader(f"📌 {found_player}")
             st.dataframe(
-                prep(adf),
-                height=218,
+                style_table(player_rows[["Market", "Team", "Player", "Odds", "Edge %", "Adj Edge %"]],
+                            odds_col="Odds"),
                 use_container_width=True,
                 hide_index=True
             )
-
-
-# ─── 11. Disposals – same + add the 30+ table ──────────────────────────────
-elif dashboard_tab == "Disposals":
-    for label, hdf, adf in [
-        ("15+ Disposals", home_15, away_15),
-        ("20+ Disposals", home_20, away_20),
-        ("25+ Disposals", home_25, away_25),
-        ("30+ Disposals", home_30, away_30),   # new!
-    ]:
-        st.subheader(label)
-        c1, c2 = st.columns(2)
-
-        with c1:
-            st.caption(game_info["home"])
-            if not hdf.empty:
+            st.markdown("---")
+
+    # ─── 10. Goalscorer – show Odds, Edge % and Adj Edge % ────────────────────
+    if dashboard_tab == "Goalscorer":
+        for label, hdf, adf in [
+            ("Anytime Goalscorer", home_ags, away_ags),
+            ("2+ Goalscorer",      home_2plus, away_2plus),
+            ("3+ Goalscorer",      home_3plus, away_3plus),
+        ]:
+            st.subheader(label)
+            c1, c2 = st.columns(2)
+
+            with c1:
+                st.caption(game_info["home"])
                 st.dataframe(
                     prep(hdf),
                     height=218,
                     use_container_width=True,
                     hide_index=True
                 )
-            else:
-                st.info("No data for home team.")
 
-        with c2:
-            st.caption(game_info["away"])
-            if not adf.empty:
+            with c2:
+                st.caption(game_info["away"])
                 st.dataframe(
                     prep(adf),
                     height=218,
                     use_container_width=True,
                     hide_index=True
                 )
-            else:
-                st.info("No data for away team.")
+
+
+    # ─── 11. Disposals – same + add the 30+ table ──────────────────────────────
+    elif dashboard_tab == "Disposals":
+        for label, hdf, adf in [
+            ("15+ Disposals", home_15, away_15),
+            ("20+ Disposals", home_20, away_20),
+            ("25+ Disposals", home_25, away_25),
+            ("30+ Disposals", home_30, away_30),   # new!
+        ]:
+            st.subheader(label)
+            c1, c2 = st.columns(2)
+
+            with c1:
+                st.caption(game_info["home"])
+                if not hdf.empty:
+                    st.dataframe(
+                        prep(hdf),
+                        height=218,
+                        use_container_width=True,
+                        hide_index=True
+                    )
+                else:
+                    st.info("No data for home team.")
+
+            with c2:
+                st.caption(game_info["away"])
+                if not adf.empty:
+                    st.dataframe(
+                        prep(adf),
+                        height=218,
+                        use_container_width=True,
+                        hide_index=True
+                    )
+                else:
+                    st.info("No data for away team.")
+
+    # ----------------------------------------------------
+    # 12. Teams
+    elif dashboard_tab == "Teams":
+        # define the column headings you want
+        headers = ["Date","Game","Result","Line","O/U"]
+
+        # Last 5
+        st.subheader("Last 5")
+        L,_,R = st.columns([1,0.02,1])
+        with L:
+            st.caption(f"*{game_info['home']}*")
+            st.markdown(
+                team_table_html(
+                    overall, "overall", game_info["home"],
+                    add_divider=True,
+                    date_fmt="%d %b",
+                    headers=headers
+                ),
+                unsafe_allow_html=True
+            )
+        with R:
+            st.caption(f"*{game_info['away']}*")
+            st.markdown(
+                team_table_html(
+                    overall, "overall", game_info["away"],
+                    add_divider=False,
+                    date_fmt="%d %b",
+                    headers=headers
+                ),
+                unsafe_allow_html=True
+            )
+
+        # Last 5 at Venue
+        # validation warns when a team has no venue rows; fall back to the sheet's city
+        home_venue = venue.loc[venue["Team"] == game_info["home"], "Venue"]
+        stadium = home_venue.iloc[0] if len(home_venue) else game_info["city"]
+        st.subheader(f"Last 5 at {stadium}")
+        L,_,R = st.columns([1,0.02,1])
+        with L:
+            st.caption(f"*{game_info['home']}*")
+            st.markdown(
+                team_table_html(
+                    venue, "venue", game_info["home"],
+                    add_divider=True,
+                    date_fmt="%d/%m/%Y",
+                    headers=headers
+                ),
+                unsafe_allow_html=True
+            )
+        with R:
+            st.caption(f"*{game_info['away']}*")
+            st.markdown(
+                team_table_html(
+                    venue, "venue", game_info["away"],
+                    add_divider=False,
+                    date_fmt="%d/%m/%Y",
+                    headers=headers
+                ),
+                unsafe_allow_html=True
+            )
+
+    # ----------------------------------------------------
+    # 13. Same Game Multis
+    else:
+        same_game_multis()
 
 # ----------------------------------------------------
+# Best of Round – every game & market from one cached pass
+# (own fragment: the filters only rerun the table)
+@st.fragment
+def best_of_round():
+    c1, c2, c3, c4 = st.columns([2, 1.2, 1, 1])
+    markets = c1.multiselect("Markets", round_data.MARKETS, default=round_data.MARKETS)
+    table = round_table
+    odds_max = float(np.nanmax(table.num("Odds"))) if len(table) else 20.0
+    odds_range = c2.slider("Odds", 1.0, max(odds_max, 1.01), (1.0, max(odds_max, 1.01)), step=0.05)
+    min_edge = c3.number_input("Min edge (%)", value=0.0, step=1.0)
+    sort_by = c4.selectbox("Sort by", ["Edge %", "Adj Edge %", "Odds"])
+
+    best = round_data.filter_markets(
+        table, markets=markets, odds_range=odds_range,
+        min_edge=min_edge, sort_by=sort_by
+    )
+    st.caption(f"{len(best)} of {len(table)} player markets")
+    st.dataframe(
+        style_table(
+            best[["Game", "Market", "Team", "Player", "Odds", "Edge %", "Adj Edge %"]],
+            odds_col="Odds"
+        ),
+        use_container_width=True,
+        hide_index=True
+    )
+
 # ----------------------------------------------------
-# 12. Teams
-else:
-    # define the column headings you want
-    headers = ["Date","Game","Result","Line","O/U"]
-
-    # Last 5
-    st.subheader("Last 5")
-    L,_,R = st.columns([1,0.02,1])
-    with L:
-        st.caption(f"*{game_info['home']}*")
-        df_h = overall[overall["Team"] == game_info["home"]]
-        st.markdown(
-            make_table_html(
-                df_h,
-                add_divider=True,
-                date_fmt="%d %b",
-                headers=headers
-            ),
-            unsafe_allow_html=True
-        )
-    with R:
-        st.caption(f"*{game_info['away']}*")
-        df_a = overall[overall["Team"] == game_info["away"]]
-        st.markdown(
-            make_table_html(
-                df_a,
-                add_divider=False,
-                date_fmt="%d %b",
-                headers=headers
-            ),
-            unsafe_allow_html=True
+# Same Game Multis – joint pricing across every market above
+# (own fragment: the sliders only re-rank the cached pricing)
+@st.fragment
+def same_game_multis():
+    import sgm_pricer
+    legs = sgm_pricer.legs_from_blocks({
+        "Anytime Goalscorer": (home_ags, away_ags),
+        "2+ Goalscorer":      (home_2plus, away_2plus),
+        "3+ Goalscorer":      (home_3plus, away_3plus),
+        "15+ Disposals":      (home_15, away_15),
+        "20+ Disposals":      (home_20, away_20),
+        "25+ Disposals":      (home_25, away_25),
+        "30+ Disposals":      (home_30, away_30),
+    })
+
+    c1, c2, c3 = st.columns(3)
+    max_legs = c1.radio("Legs", [2, 3], index=1, horizontal=True)
+    min_prob = c2.slider("Min hit chance (%)", 0, 50, 5) / 100
+    min_edge = c3.slider("Min edge (%)", -50, 100, 0)
+
+    priced = price_game_multis(selected_game, round_version, legs, max_legs)
+    best = sgm_pricer.rank_multis(priced, min_edge=min_edge, min_prob=min_prob)
+
+    st.subheader("Best Same Game Multis")
+    st.caption(
+        f"{len(priced):,} multis priced from {len(legs)} legs. "
+        "Offered odds are the straight product of the leg odds – "
+        "bookies usually shade this for correlated legs."
+    )
+    if best.empty:
+        st.info("No multis match those filters.")
+    else:
+        st.dataframe(
+            best.style.format({
+                "Prob":     lambda x: f"{x*100:.1f}%",
+                "FairOdds": lambda x: f"${x:.2f}",
+                "Offered":  lambda x: f"${x:.2f}",
+                "Edge %":   lambda x: f"{x:.1f}%",
+            }),
+            use_container_width=True,
+            hide_index=True
         )
 
-    # Last 5 at Venue
-    stadium = venue[venue["Team"] == game_info["home"]]["Venue"].iloc[0]
-    st.subheader(f"Last 5 at {stadium}")
-    L,_,R = st.columns([1,0.02,1])
-    with L:
-        st.caption(f"*{game_info['home']}*")
-        df_hv = venue[venue["Team"] == game_info["home"]]
-        st.markdown(
-            make_table_html(
-                df_hv,
-                add_divider=True,
-                date_fmt="%d/%m/%Y",
-                headers=headers
-            ),
-            unsafe_allow_html=True
-        )
-    with R:
-        st.caption(f"*{game_info['away']}*")
-        df_av = venue[venue["Team"] == game_info["away"]]
-        st.markdown(
-            make_table_html(
-                df_av,
-                add_divider=False,
-                date_fmt="%d/%m/%Y",
-                headers=headers
-            ),
-            unsafe_allow_html=True
-        )
\ No newline at end of file
+dashboard()
+startup_profile.finish()
@@ -0,0 +1,240 @@
+# ----------------------------------------------------
+# ROUND API – read-only JSON over WSGI
+# Serves the same round_data tables as the dashboard. Every response is
+# serialised, gzipped and ETagged once per data version, so a repeat poll is
+# a dict lookup (or a bodiless 304).
+#
+#   python api.py --port 8000          # stdlib server
+#   gunicorn api:app                   # or any WSGI server
+#
+# GET /fixtures
+# GET /games/<game>/markets
+# GET /games/<game>/last5
+# GET /edges/top
+# GET /health
+# ----------------------------------------------------
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import re
+import threading
+from datetime import date, datetime
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIServer, make_server
+
+import numpy as np
+import pandas as pd
+
+import round_data
+
+MAX_AGE = 30        # seconds clients/CDNs may reuse a response without asking
+MIN_GZIP = 512      # don't bother compressing tiny bodies
+
+log = logging.getLogger(__name__)
+
+
+def slugify(name):
+    return re.sub(r"[^a-z0-9]+", "-", str(name).lower()).strip("-")
+
+
+def _default(o):
+    if isinstance(o, (date, datetime, pd.Timestamp)):
+        return o.isoformat()
+    if isinstance(o, np.generic):
+        return o.item()
+    return str(o)
+
+
+def records(df):
+    """DataFrame -> list of dicts with NaN as null."""
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+class Response:
+    __slots__ = ("body", "gz", "etag", "gz_etag")
+
+    def __init__(self, payload):
+        self.body = json.dumps(payload, default=_default, separators=(",", ":")).encode()
+        self.gz = gzip.compress(self.body, 9) if len(self.body) >= MIN_GZIP else None
+        digest = hashlib.sha1(self.body).hexdigest()[:20]
+        # each content coding is its own representation, so it gets its own
+        # strong validator – a cache must never pair a 304 with the wrong body
+        self.etag = f'"{digest}"'
+        self.gz_etag = f'"{digest}-gz"'
+
+
+def accepts_gzip(header):
+    """True if an Accept-Encoding header allows gzip (honours q=0 and '*')."""
+    q = {}
+    for part in header.split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        if not coding:
+            continue
+        weight = 1.0
+        for p in params:
+            name, _, value = p.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        q[coding.lower()] = weight
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in q:
+            return q[coding] > 0
+    return False
+
+
+def etag_matches(header, *etags):
+    """If-None-Match check – weak comparison, any of the given validators."""
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return "*" in tags or any(e in tags for e in etags)
+
+
+# ————— Payloads —————
+def last5(df, team):
+    return records(df[df["Team"] == team])
+
+
+def build_payloads(fixtures, markets, overall, venue):
+    """{path: payload} for every endpoint, from one snapshot of the data."""
+    out = {}
+    games = []
+    for gm, info in fixtures.items():
+        slug = slugify(gm)
+        games.append({"game": gm, "slug": slug, **info})
+
+        g = markets[markets["Game"] == gm]
+        out[f"/games/{slug}/markets"] = {
+            "game": gm,
+            "markets": {
+                m: {side: records(b.drop(columns=["Game", "Sheet", "Market", "Side"]))
+                    for side, b in gm_m.groupby("Side", sort=False)}
+                for m, gm_m in g.groupby("Market", sort=False)
+            },
+        }
+
+        out[f"/games/{slug}/last5"] = {
+            "game": gm,
+            "home": {"team": info["home"],
+                     "overall": last5(overall, info["home"]),
+                     "venue":   last5(venue, info["home"])},
+            "away": {"team": info["away"],
+                     "overall": last5(overall, info["away"]),
+                     "venue":   last5(venue, info["away"])},
+        }
+
+    out["/fixtures"] = {"round": round_data.ROUND, "games": games}
+
+    # best edge per game & market, best first
+    top = (markets.dropna(subset=["Edge %"])
+                  .sort_values("Edge %", ascending=False)
+                  .drop_duplicates(["Game", "Market"]))
+    out["/edges/top"] = {"edges": records(top.drop(columns=["Sheet", "Row"]))}
+    return out
+
+
+# ————— WSGI app —————
+class RoundAPI:
+    def __init__(self, export_file=round_data.EXPORT_FILE, summary_file=round_data.SUMMARY_FILE):
+        self.export_file = export_file
+        self.summary_file = summary_file
+        self.version = None
+        self.error = None       # why the current version couldn't be loaded
+        self.responses = {}
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Rebuild every response if either workbook has changed."""
+        version = (round_data.data_version(self.export_file),
+                   round_data.data_version(self.summary_file))
+        if version == self.version:
+            return
+        with self._lock:
+            if version == self.version:
+                return
+            try:
+                fixtures, markets = round_data.load_round(self.export_file)
+                overall, venue = round_data.load_stats(self.summary_file)
+            except Exception as e:
+                # don't re-parse a bad file on every request – wait for the next export
+                self.version = version
+                self.error = str(e)
+                log.exception("round data %s failed to load – %s", version,
+                              "still serving the last good version" if self.responses else "nothing to serve")
+                raise
+            payloads = build_payloads(fixtures, markets, overall, venue)
+            payloads["/health"] = {"version": str(version), "games": len(fixtures)}
+            # swap the whole dict in one go so readers never see a half-built set
+            self.responses = {p: Response(v) for p, v in payloads.items()}
+            self.version = version
+            self.error = None
+
+    def __call__(self, environ, start_response):
+        if environ["REQUEST_METHOD"] not in ("GET", "HEAD"):
+            start_response("405 Method Not Allowed", [("Allow", "GET, HEAD")])
+            return [b""]
+        try:
+            self.refresh()
+        except Exception:
+            pass        # logged once per version in refresh()
+        # keep serving the last good data if a re-export is half-written
+        if not self.responses:
+            return self._error(start_response, "503 Service Unavailable", self.error or "no data loaded")
+
+        path = environ.get("PATH_INFO", "/").rstrip("/") or "/"
+        resp = self.responses.get(path)
+        if resp is None:
+            return self._error(start_response, "404 Not Found", f"no such endpoint: {path}")
+
+        gz = resp.gz is not None and accepts_gzip(environ.get("HTTP_ACCEPT_ENCODING", ""))
+        etag = resp.gz_etag if gz else resp.etag
+        headers = [
+            ("ETag", etag),
+            ("Cache-Control", f"public, max-age={MAX_AGE}"),
+            ("Vary", "Accept-Encoding"),
+        ]
+        # only the validator of the representation negotiated now – a client
+        # holding the identity body that now asks for gzip gets the gzip body
+        if etag_matches(environ.get("HTTP_IF_NONE_MATCH", ""), etag):
+            start_response("304 Not Modified", headers)
+            return [b""]
+
+        body = resp.gz if gz else resp.body
+        if gz:
+            headers.append(("Content-Encoding", "gzip"))
+        headers += [("Content-Type", "application/json"), ("Content-Length", str(len(body)))]
+        start_response("200 OK", headers)
+        return [b"" if environ["REQUEST_METHOD"] == "HEAD" else body]
+
+    def _error(self, start_response, status, msg):
+        body = json.dumps({"error": msg}).encode()
+        start_response(status, [("Content-Type", "application/json"),
+                                ("Content-Length", str(len(body)))])
+        return [body]
+
+
+app = RoundAPI()
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve the round data as JSON.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    args = ap.parse_args()
+
+    app.refresh()
+    with make_server(args.host, args.port, app, server_class=ThreadingWSGIServer) as httpd:
+        print(f"✅ Serving round {round_data.ROUND} on http://{args.host}:{args.port}")
+        httpd.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+# ----------------------------------------------------
+# BULK SENDER – mailing-list sends through the Gmail API
+#
+#   python bulk_sender.py --campaign round-24 --subject "Round 24 is live" \
+#       --body-file email.txt --recipients subscribers.txt [--fake]
+#
+# Recipients are split into batches, each batch goes out as one batched HTTP
+# request from a small worker pool, throttled by a token bucket. Every
+# delivered address is appended to a per-campaign send log, so re-running a
+# crashed send skips whoever already got it. --fake runs keep their logs in
+# send_logs/fake/, so a dry run can't mark anyone as already sent.
+# ----------------------------------------------------
+
+import abc
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# ————— CONFIG —————
+BATCH_SIZE  = 50        # messages per batched HTTP request
+WORKERS     = 4
+RATE        = 10.0      # messages / second across all workers
+BURST       = 20
+MAX_RETRIES = 5
+BACKOFF     = 1.0       # seconds, doubled per retry (plus jitter)
+LOG_DIR     = "send_logs"
+FAKE_LOG_DIR = os.path.join(LOG_DIR, "fake")   # --fake runs never touch the real logs
+# ——————————————————
+
+
+class SendError(Exception):
+    def __init__(self, msg, retryable=False):
+        super().__init__(msg)
+        self.retryable = retryable
+
+
+# ————— Transports —————
+class Transport(abc.ABC):
+    """
+    Sends a batch of (recipient, subject, text) messages. Returns one entry
+    per message, in order: a message id on success, or a SendError.
+    """
+    @abc.abstractmethod
+    def send_batch(self, messages):
+        ...
+
+
+def unanswered(results, why):
+    """
+    Batch results with every slot nothing answered for (None) turned into a
+    non-retryable SendError: the message may well have gone out, so it's
+    logged as failed for a person to check rather than re-sent.
+    """
+    return [SendError(f"{why} – delivery unknown") if r is None else r for r in results]
+
+
+class GmailTransport(Transport):
+    def __init__(self):
+        import gmail_sender
+        self._gmail = gmail_sender
+        self._creds = gmail_sender.get_credentials()
+        self._token = self._creds.token
+        self._token_lock = threading.Lock()
+        # the underlying httplib2 connection isn't thread-safe: one client per worker
+        self._local = threading.local()
+
+    def _service(self):
+        if not hasattr(self._local, "service"):
+            from googleapiclient.discovery import build
+            self._local.service = build("gmail", "v1", credentials=self._creds)
+        return self._local.service
+
+    def _save_token(self):
+        # the client refreshes an expired token by itself – keep the new one,
+        # or the next run starts with a stale token.json and refreshes again
+        with self._token_lock:
+            if self._creds.token != self._token:
+                self._gmail.save_credentials(self._creds)
+                self._token = self._creds.token
+
+    def send_batch(self, messages):
+        from googleapiclient.errors import HttpError
+
+        service = self._service()
+        results = [None] * len(messages)
+
+        def callback(request_id, response, exception):
+            i = int(request_id)
+            if exception is None:
+                results[i] = response.get("id")
+            else:
+                status = getattr(getattr(exception, "resp", None), "status", None)
+                retryable = not isinstance(exception, HttpError) or status in (429, 500, 502, 503, 504)
+                results[i] = SendError(str(exception), retryable=retryable)
+
+        batch = service.new_batch_http_request(callback=callback)
+        for i, (recipient, subject, text) in enumerate(messages):
+            body = self._gmail.create_message(recipient, subject, text)
+            batch.add(service.users().messages().send(userId="me", body=body), request_id=str(i))
+        try:
+            batch.execute()
+        except Exception as e:
+            # the connection can drop part-way through a batch: messages the
+            # callback already answered keep their result, the rest may have
+            # been delivered and must not be blindly re-sent
+            return unanswered(results, f"batch failed: {e}")
+        finally:
+            self._save_token()
+        return unanswered(results, "no response in the batch")
+
+
+class FakeTransport(Transport):
+    """Local stand-in for tests and dry runs. `fail` maps recipient -> failures before success."""
+    def __init__(self, fail=None, latency=0.0):
+        self.sent = []
+        self.fail = dict(fail or {})
+        self.latency = latency
+        self._lock = threading.Lock()
+
+    def send_batch(self, messages):
+        time.sleep(self.latency)
+        out = []
+        with self._lock:
+            for recipient, subject, text in messages:
+                if self.fail.get(recipient, 0) > 0:
+                    self.fail[recipient] -= 1
+                    out.append(SendError("fake 503", retryable=True))
+                else:
+                    self.sent.append((recipient, subject, text))
+                    out.append(f"fake-{len(self.sent)}")
+        return out
+
+
+# ————— Rate limiting —————
+class TokenBucket:
+    def __init__(self, rate=RATE, capacity=BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, n=1):
+        """Block until `n` tokens are available, then take them."""
+        n = min(n, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return
+                wait = (n - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# ————— Send log —————
+class SendLog:
+    """
+    Append-only JSONL of delivered recipients for one campaign. Lines are
+    flushed and fsynced per batch, so after a crash at most the batch in
+    flight can be re-sent.
+    """
+    def __init__(self, campaign, log_dir=LOG_DIR):
+        os.makedirs(log_dir, exist_ok=True)
+        self.path = os.path.join(log_dir, f"{campaign}.jsonl")
+        self.sent = set()
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue    # torn last line from a crash
+                    if rec.get("status") == "sent":
+                        self.sent.add(rec["to"])
+        self._f = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def record(self, entries):
+        with self._lock:
+            for rec in entries:
+                self._f.write(json.dumps(rec) + "\n")
+                if rec["status"] == "sent":
+                    self.sent.add(rec["to"])
+            self._f.flush()
+            os.fsync(self._f.fileno())
+
+    def close(self):
+        self._f.close()
+
+
+# ————— Bulk send —————
+def send_bulk(recipients, subject, text, *, campaign, transport=None, log_dir=LOG_DIR,
+              batch_size=BATCH_SIZE, workers=WORKERS, rate=RATE, burst=BURST,
+              max_retries=MAX_RETRIES, backoff=BACKOFF):
+    """
+    Send one email to every recipient not already in the campaign's log.
+    Returns {"sent": n, "skipped": n, "failed": [recipients]}.
+    """
+    transport = transport or GmailTransport()
+    log = SendLog(campaign, log_dir)
+    bucket = TokenBucket(rate, max(burst, batch_size))
+
+    todo = list(dict.fromkeys(r.strip() for r in recipients if r.strip()))
+    skipped = sum(r in log.sent for r in todo)
+    todo = [r for r in todo if r not in log.sent]
+    batches = [todo[i:i + batch_size] for i in range(0, len(todo), batch_size)]
+
+    def run(batch):
+        pending, failed, sent = batch, [], 0
+        for attempt in range(max_retries + 1):
+            if attempt:
+                time.sleep(backoff * 2 ** (attempt - 1) * (1 + random.random()))
+            bucket.acquire(len(pending))
+            results = transport.send_batch([(r, subject, text) for r in pending])
+
+            done, retry = [], []
+            for r, res in zip(pending, results):
+                if not isinstance(res, SendError):
+                    done.append({"to": r, "status": "sent", "id": res, "ts": time.time()})
+                elif res.retryable and attempt < max_retries:
+                    retry.append(r)
+                else:
+                    failed.append((r, res))
+            log.record(done)
+            sent += len(done)
+            pending = retry
+            if not pending:
+                break
+
+        log.record([{"to": r, "status": "failed", "error": str(e), "ts": time.time()}
+                    for r, e in failed])
+        return sent, [r for r, _ in failed]
+
+    sent, failed = 0, []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for n, f in pool.map(run, batches):
+                sent += n
+                failed += f
+    finally:
+        log.close()
+    return {"sent": sent, "skipped": skipped, "failed": failed}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Send one email to a mailing list.")
+    ap.add_argument("--campaign", required=True, help="name of the send log (re-use to resume)")
+    ap.add_argument("--subject", required=True)
+    ap.add_argument("--body-file", required=True)
+    ap.add_argument("--recipients", required=True, help="text file, one address per line")
+    ap.add_argument("--workers", type=int, default=WORKERS)
+    ap.add_argument("--rate", type=float, default=RATE, help="messages per second")
+    ap.add_argument("--fake", action="store_true", help="use the local fake transport")
+    args = ap.parse_args()
+
+    with open(args.body_file, encoding="utf-8") as f:
+        text = f.read()
+    with open(args.recipients, encoding="utf-8") as f:
+        recipients = f.read().splitlines()
+
+    result = send_bulk(recipients, args.subject, text, campaign=args.campaign,
+                       transport=FakeTransport() if args.fake else None,
+                       log_dir=FAKE_LOG_DIR if args.fake else LOG_DIR,
+                       workers=args.workers, rate=args.rate)
+    print(f"✅ Sent {result['sent']}, skipped {result['skipped']} already sent, "
+          f"{len(result['failed'])} failed")
+    for r in result["failed"]:
+        print(f"   ❌ {r}")
+
+
+if __name__ == "__main__":
+    main()
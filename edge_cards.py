@@ -0,0 +1,249 @@
+# ----------------------------------------------------
+# EDGE CARDS – shareable PNG/WebP cards for every top-edge row
+#
+#   python edge_cards.py                              # top_edges_per_game.csv -> cards/
+#   python edge_cards.py top_edges.ndjson --format webp --workers 4
+#
+# Reads Bets.py output – the wide CSV (old "11%" / " $2.80 " cells included)
+# or its NDJSON – and draws one card per (game, market): both team logos,
+# player, market, odds and edge. Logos are decoded once in the parent and
+# handed to the pool as raw pixels. cards/manifest.json remembers what each
+# card was drawn from, so a rerun only redraws rows that changed (and
+# removes cards whose row is gone).
+# ----------------------------------------------------
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# ————— CONFIG —————
+INPUT      = "top_edges_per_game.csv"
+OUT_DIR    = "cards"
+SIZE       = (1200, 675)
+LOGO_SIZE  = 150
+BACKGROUND = "#FFF8F0"      # same cream as the dashboard
+INK        = "#1b1b1b"
+GOOD       = "#1e8e3e"
+BAD        = "#c5221f"
+FONT       = "DejaVuSans.ttf"
+FONT_BOLD  = "DejaVuSans-Bold.ttf"
+TEMPLATE   = 1              # bump when the layout changes to redraw everything
+MARKET_NAMES = {
+    "AGS": "Anytime Goalscorer", "2+": "2+ Goals", "3+": "3+ Goals",
+    "15+": "15+ Disposals", "20+": "20+ Disposals", "25+": "25+ Disposals",
+    "30+": "30+ Disposals",
+}
+# ——————————————————
+
+
+# ————— Input —————
+def _number(s):
+    """'$2.80', ' 11% ', 0.11 -> float (NaN when blank)."""
+    return pd.to_numeric(s.astype(str).str.replace(r"[%$,\s]", "", regex=True), errors="coerce")
+
+
+def _edge(s):
+    # the old hand-made CSV has '11%'; Bets.py writes the fraction 0.11
+    pct = s.astype(str).str.contains("%")
+    return _number(s).where(~pct, _number(s) / 100)
+
+
+def load_edges(path=INPUT):
+    """Long frame Round, Game, Market, Player, Edge (fraction), Odds from either output format."""
+    if path.endswith((".ndjson", ".jsonl")):
+        df = pd.read_json(path, lines=True)
+    else:
+        wide = pd.read_csv(path, dtype=str)
+        wide.columns = wide.columns.str.strip()      # ' AGS_Odds ' in older exports
+        markets = [c[:-len("_Player")] for c in wide.columns if c.endswith("_Player")]
+        df = pd.concat([
+            pd.DataFrame({
+                "Game": wide["Game"],
+                "Market": m,
+                "Player": wide[f"{m}_Player"],
+                "Edge": wide.get(f"{m}_Edge"),
+                "Odds": wide.get(f"{m}_Odds"),
+            }) for m in markets
+        ], ignore_index=True)
+    if "Round" not in df:
+        df.insert(0, "Round", None)
+    df["Edge"] = _edge(df["Edge"])
+    df["Odds"] = _number(df["Odds"])
+    df["Player"] = df["Player"].astype("string").str.strip()
+    df["Game"] = df["Game"].astype(str).str.strip()
+    return df.dropna(subset=["Player", "Edge", "Odds"]).reset_index(drop=True)
+
+
+# ————— Logos —————
+def logo_path(team):
+    """Logo file for a team; sheet names are cut at 31 chars, so fall back to a prefix match."""
+    for ext in (".png", ".jpg", ".jpeg"):
+        if os.path.exists(team + ext):
+            return team + ext
+    hits = [f for ext in (".png", ".jpg", ".jpeg") for f in glob.glob(glob.escape(team) + "*" + ext)]
+    return hits[0] if len(hits) == 1 else None
+
+
+def decode_logos(teams, size=LOGO_SIZE):
+    """{team: (size, RGBA bytes)} – decoded and resized once, cheap to ship to workers."""
+    from PIL import Image
+    logos = {}
+    for team in teams:
+        fn = logo_path(team)
+        if fn:
+            im = Image.open(fn).convert("RGBA")
+            im.thumbnail((size, size))
+            logos[team] = (im.size, im.tobytes())
+    return logos
+
+
+# ————— Worker —————
+_logos = {}
+_fonts = {}
+
+
+def _init(logos):
+    from PIL import Image
+    _logos.update({t: Image.frombytes("RGBA", sz, raw) for t, (sz, raw) in logos.items()})
+
+
+def _font(size, bold=False):
+    from PIL import ImageFont
+    key = (size, bold)
+    if key not in _fonts:
+        try:
+            _fonts[key] = ImageFont.truetype(FONT_BOLD if bold else FONT, size)
+        except OSError:
+            _fonts[key] = ImageFont.load_default(size)
+    return _fonts[key]
+
+
+def teams(game):
+    home, _, away = game.partition(" VS ")
+    return home.strip(), away.strip()
+
+
+def full_name(team):
+    # 'Port Adelai' (cut-off sheet name) -> 'Port Adelaide' from its logo file
+    fn = logo_path(team)
+    return os.path.splitext(fn)[0] if fn else team
+
+
+def draw_card(card):
+    """Render one card dict to disk (runs in a pool worker)."""
+    from PIL import Image, ImageDraw
+
+    w, h = SIZE
+    im = Image.new("RGB", SIZE, BACKGROUND)
+    d = ImageDraw.Draw(im)
+    home, away = teams(card["Game"])
+
+    # header: round · market
+    title = MARKET_NAMES.get(card["Market"], card["Market"])
+    if card["Round"] is not None:
+        title = f"ROUND {card['Round']}  ·  {title}"
+    d.text((w / 2, 60), title.upper(), font=_font(34, True), fill=INK, anchor="mm")
+
+    # matchup: logos either side of VS, names under them
+    for team, x in ((home, w * 0.25), (away, w * 0.75)):
+        logo = _logos.get(team)
+        if logo is not None:
+            im.paste(logo, (int(x - logo.width / 2), int(205 - logo.height / 2)), logo)
+        d.text((x, 305), card["names"].get(team, team), font=_font(28), fill=INK, anchor="mm")
+    d.text((w / 2, 205), "VS", font=_font(44, True), fill=INK, anchor="mm")
+
+    # player, odds, edge
+    d.text((w / 2, 400), card["Player"], font=_font(64, True), fill=INK, anchor="mm")
+    edge = card["Edge"] * 100
+    d.text((w * 0.35, 510), f"${card['Odds']:.2f}", font=_font(56, True), fill=INK, anchor="mm")
+    d.text((w * 0.65, 510), f"{edge:+.0f}% edge", font=_font(56, True),
+           fill=GOOD if edge > 0 else BAD, anchor="mm")
+
+    d.line((60, h - 80, w - 60, h - 80), fill="#d9d4cc", width=2)
+    d.text((w / 2, h - 45), "THE MODEL  ·  patreon.com/The_Model", font=_font(24), fill="#666", anchor="mm")
+
+    tmp = card["path"] + ".tmp"
+    # plain zlib – optimize=True triples the encode time for ~2% smaller files
+    im.save(tmp, format=card["format"], **({"quality": 90} if card["format"] == "WEBP" else {}))
+    os.replace(tmp, card["path"])
+    return card["path"]
+
+
+# ————— Batch —————
+def slug(s):
+    return re.sub(r"[^a-z0-9]+", "-", str(s).lower()).strip("-")
+
+
+def card_key(row):
+    """Everything that changes the picture – a different key means redraw."""
+    raw = json.dumps([TEMPLATE, row["Round"], row["Game"], row["Market"], row["Player"],
+                      round(row["Edge"], 4), round(row["Odds"], 2), list(SIZE)], default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def build_cards(edges, out=OUT_DIR, fmt="png", workers=None, force=False):
+    """Draw every changed card; returns (drawn, unchanged, removed)."""
+    os.makedirs(out, exist_ok=True)
+    manifest_fn = os.path.join(out, "manifest.json")
+    try:
+        with open(manifest_fn, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    cards, current = [], {}
+    for row in edges.to_dict(orient="records"):
+        row["Round"] = None if pd.isna(row["Round"]) else int(row["Round"])
+        prefix = f"r{row['Round']}-" if row["Round"] is not None else ""
+        name = f"{prefix}{slug(row['Game'])}-{slug(row['Market'])}.{fmt}"
+        key = current[name] = card_key(row)
+        if force or manifest.get(name) != key or not os.path.exists(os.path.join(out, name)):
+            cards.append(dict(row, path=os.path.join(out, name), format=fmt.upper()))
+
+    if cards:
+        needed = {t for c in cards for t in teams(c["Game"])}
+        names = {t: full_name(t) for t in needed}
+        for c in cards:
+            c["names"] = names
+        logos = decode_logos(needed)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init, initargs=(logos,)) as pool:
+            list(pool.map(draw_card, cards, chunksize=max(1, len(cards) // (4 * (workers or os.cpu_count() or 1)))))
+
+    removed = [n for n in manifest if n not in current]
+    for n in removed:
+        try:
+            os.remove(os.path.join(out, n))
+        except FileNotFoundError:
+            pass
+
+    with open(manifest_fn + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=1, sort_keys=True)
+    os.replace(manifest_fn + ".tmp", manifest_fn)
+    return len(cards), len(current) - len(cards), len(removed)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Draw a shareable card for every top-edge row.")
+    ap.add_argument("input", nargs="?", default=INPUT, help="Bets.py output (.csv or .ndjson)")
+    ap.add_argument("--out", default=OUT_DIR)
+    ap.add_argument("--format", choices=["png", "webp"], default="png")
+    ap.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    ap.add_argument("--force", action="store_true", help="redraw every card")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    drawn, same, removed = build_cards(load_edges(args.input), args.out, args.format,
+                                       args.workers, args.force)
+    print(f"✅ {drawn} cards drawn, {same} unchanged, {removed} removed "
+          f"in '{args.out}/' ({time.perf_counter() - t0:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
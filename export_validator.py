@@ -0,0 +1,302 @@
+# ----------------------------------------------------
+# EXPORT VALIDATOR – check a round's workbooks once, before anything uses them
+#
+#   python export_validator.py                      # report to stdout, exit 1 on errors
+#   python export_validator.py --out report.json
+#
+# Export_simple.xlsx: sheet layout (title / date / city), every market label
+# exactly twice with the right header row, numeric odds/edges, players and
+# teams present, team names in the logo set.
+# upcoming_round_summary.xlsx: required columns and values, and that every
+# fixture's teams have Last-5 and venue rows.
+# Each check runs over the whole round as array ops, not per cell.
+#
+# round_data runs these once per workbook version as part of the cached
+# parse: an export with errors raises InvalidExport (also cached, so a bad
+# file isn't re-parsed on every rerun) and never reaches the caches or the
+# snapshot. Warnings are reported but don't block.
+# ----------------------------------------------------
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import round_data
+
+# ————— CONFIG —————
+LOGO_DIR       = "."
+EDGE_TOLERANCE = 1.0        # Edge % may differ from (Odds/Fair - 1) * 100 by this much
+STATS_COLUMNS  = ["GameDate", "Venue", "Team", "HomeAway", "Opponent", "Res",
+                  "Score", "Line", "Covered", "O/U", "O/U Res"]
+STATS_VALUES   = {"HomeAway": {"Home", "Away"}, "Res": {"W", "L", "D"},
+                  "Covered": {"Y", "N"}, "O/U Res": {"Over", "Under"}}
+# ——————————————————
+
+EXPORT_CHECKS = ["layout", "labels", "header", "players", "dtypes", "values", "teams"]
+STATS_CHECKS  = ["layout", "dtypes", "values", "coverage"]
+# part of round_data's disk cache key – bump it when the checks change, so
+# parses cached under older rules (or before validation) are re-validated
+VERSION = 2
+
+
+class InvalidExport(ValueError):
+    """A workbook failed validation; .report has every issue found."""
+    def __init__(self, report):
+        self.report = report
+        errors = [i for i in report["issues"] if i["severity"] == "error"]
+        first = "; ".join(i["message"] for i in errors[:3])
+        more = f" (+{len(errors) - 3} more)" if len(errors) > 3 else ""
+        super().__init__(f"{report['workbook']}: {len(errors)} validation errors – {first}{more}")
+
+
+def _issue(severity, check, workbook, message, sheet=None, market=None, row=None, column=None, value=None):
+    return {"severity": severity, "check": check, "workbook": os.path.basename(workbook),
+            "sheet": sheet, "market": market, "row": row, "column": column,
+            "value": None if value is None or pd.isna(value) else str(value), "message": message}
+
+
+def _issues(severity, check, workbook, frame, message):
+    """One issue per row of `frame` (vectorised checks hand back the failing rows)."""
+    return [_issue(severity, check, workbook, message.format(**r),
+                   **{k: r.get(k) for k in ("sheet", "market", "row", "column", "value")})
+            for r in frame.to_dict(orient="records")]
+
+
+def logo_teams(logo_dir=LOGO_DIR):
+    return {os.path.splitext(os.path.basename(f))[0]
+            for ext in ("png", "jpg", "jpeg") for f in glob.glob(os.path.join(logo_dir, f"*.{ext}"))}
+
+
+def report(workbook, issues, checked):
+    errors = sum(i["severity"] == "error" for i in issues)
+    return {
+        "workbook": os.path.basename(workbook),
+        "version": list(round_data.workbook_version(workbook)) if os.path.exists(workbook) else None,
+        "checked_at": time.time(),
+        "ok": errors == 0,
+        "errors": errors,
+        "warnings": len(issues) - errors,
+        "checked": checked,
+        "issues": issues,
+    }
+
+
+# ————— Export_simple —————
+def _blocks(sheets):
+    """
+    Long frame of every market label cell in the round, with its header row
+    and 5 player rows pulled out as arrays (sheet, label, raw row number).
+    """
+    labels, headers, players = [], [], []
+    ncol = len(round_data.COLUMNS)
+    for sheet, raw in sheets.items():
+        if not round_data._is_game_sheet(raw):
+            continue
+        col0 = raw[0].to_numpy(dtype=object)
+        at = np.flatnonzero(pd.Series(col0).isin(round_data.MARKETS).to_numpy())
+        if not len(at):
+            continue
+        grid = raw.iloc[:, :ncol].reindex(columns=range(ncol)).to_numpy(dtype=object)
+        # pad so blocks cut off at the bottom of the sheet index safely
+        grid = np.vstack([grid, np.full((round_data.BLOCK_ROWS + 2, ncol), None, dtype=object)])
+        side = pd.Series(col0[at]).groupby(col0[at]).cumcount().to_numpy()
+        labels.append(pd.DataFrame({"sheet": sheet, "market": col0[at], "label_row": at, "n": side}))
+        headers.append(grid[at + 1])
+        players.append(grid[(at[:, None] + 2 + np.arange(round_data.BLOCK_ROWS)).ravel()])
+    if not labels:
+        return None, None, None
+    return (pd.concat(labels, ignore_index=True), np.concatenate(headers), np.concatenate(players))
+
+
+def check_export(sheets, workbook=round_data.EXPORT_FILE, logos=None):
+    """Every problem in an Export_simple workbook ({sheet: raw frame}) as a list of issues."""
+    issues = []
+    logos = logo_teams() if logos is None else logos
+
+    games = {s: raw for s, raw in sheets.items() if round_data._is_game_sheet(raw)}
+    # market blocks under a broken title would silently drop the whole game
+    for sheet, raw in sheets.items():
+        if sheet not in games and not raw.empty and raw[0].isin(round_data.MARKETS).any():
+            issues.append(_issue("error", "layout", workbook,
+                                 f"{sheet}: has market blocks but A1 isn't 'Home VS Away' ({raw.iat[0, 0]!r})",
+                                 sheet=sheet, row=1, column="A", value=raw.iat[0, 0]))
+    if not games:
+        return issues + [_issue("error", "layout", workbook, "no game sheets (no 'Home VS Away' title in A1)")]
+
+    # —— sheet layout: title, date, city ——
+    top = pd.DataFrame({
+        "sheet": list(games),
+        "title": [raw.iat[0, 0] for raw in games.values()],
+        "date": [raw.iat[1, 0] if raw.shape[0] > 1 else None for raw in games.values()],
+        "city": [raw.iat[1, 1] if raw.shape[0] > 1 and raw.shape[1] > 1 else None for raw in games.values()],
+    })
+    parts = top["title"].str.split(" VS ", regex=False)
+    top["home"] = parts.str[0].str.strip()
+    top["away"] = parts.str[1].str.strip()
+    bad = top[parts.str.len() != 2]
+    issues += _issues("error", "layout", workbook, bad.assign(row=1, column="A", value=bad["title"]),
+                      "{sheet}: A1 should be 'Home VS Away', got {value!r}")
+    dates = pd.to_datetime(top["date"], errors="coerce")
+    bad = top[dates.isna()]
+    issues += _issues("error", "layout", workbook, bad.assign(row=2, column="A", value=bad["date"]),
+                      "{sheet}: A2 should be the game date, got {value!r}")
+    bad = top[top["city"].isna() | (top["city"].astype(str).str.strip() == "")]
+    issues += _issues("warning", "layout", workbook, bad.assign(row=2, column="B"),
+                      "{sheet}: no city in B2 (weather lookup will fail)")
+
+    # —— team names vs the logo set ——
+    teams = pd.concat([top[["sheet", "home"]].rename(columns={"home": "team"}),
+                       top[["sheet", "away"]].rename(columns={"away": "team"})]).dropna()
+    bad = teams[~teams["team"].isin(logos)]
+    issues += _issues("warning", "teams", workbook, bad.assign(value=bad["team"]),
+                      "{sheet}: no logo for team {value!r}")
+
+    # —— block labels: every market exactly twice (home, then away) ——
+    blocks, headers, players = _blocks(games)
+    counts = pd.crosstab(blocks["sheet"], blocks["market"]) if blocks is not None else pd.DataFrame()
+    counts = counts.reindex(index=list(games), columns=round_data.MARKETS, fill_value=0)
+    long = counts.stack().rename("count").reset_index()
+    long.columns = ["sheet", "market", "count"]
+    bad = long[long["count"] != 2]
+    issues += _issues("error", "labels", workbook, bad.assign(value=bad["count"]),
+                      "{sheet}: '{market}' block found {value} times, expected 2 (home and away)")
+    if blocks is None:
+        return issues
+
+    # —— header row under each label ——
+    expected = np.array(round_data.COLUMNS, dtype=object)
+    hdr = pd.DataFrame(headers).astype(str).apply(lambda c: c.str.strip()).to_numpy()
+    wrong = (hdr != expected).any(axis=1)
+    bad = blocks[wrong].assign(row=blocks["label_row"][wrong] + 2,
+                               value=[" | ".join(h) for h in hdr[wrong]])
+    issues += _issues("error", "header", workbook, bad,
+                      "{sheet}: header under '{market}' (row {row}) is '{value}', expected "
+                      + " | ".join(round_data.COLUMNS))
+
+    # —— player rows: present, numeric, sane ——
+    n = round_data.BLOCK_ROWS
+    rows = pd.DataFrame(players, columns=round_data.COLUMNS)
+    rows["sheet"] = np.repeat(blocks["sheet"].to_numpy(), n)
+    rows["market"] = np.repeat(blocks["market"].to_numpy(), n)
+    rows["row"] = (np.repeat(blocks["label_row"].to_numpy(), n) + 3 + np.tile(np.arange(n), len(blocks)))
+    rows["side"] = np.repeat(np.where(blocks["n"].to_numpy() == 0, "home", "away"), n)
+    rows = rows[np.repeat(blocks["n"].to_numpy() < 2, n)]
+
+    # short markets leave trailing rows empty; a row with numbers but no
+    # player is data round_markets would silently drop
+    has_player = rows["Player"].notna() & (rows["Player"].astype(str).str.strip() != "")
+    has_numbers = rows[round_data.NUMERIC].notna().any(axis=1)
+    issues += _issues("warning", "players", workbook,
+                      rows[~has_player & has_numbers].assign(column="Player"),
+                      "{sheet}: '{market}' row {row} has odds but no player")
+    rows = rows[has_player]
+
+    nums = {}
+    for col in round_data.NUMERIC:
+        nums[col] = pd.to_numeric(rows[col], errors="coerce")
+        bad = rows[rows[col].notna() & nums[col].isna()]
+        issues += _issues("error", "dtypes", workbook, bad.assign(column=col, value=bad[col]),
+                          "{sheet}: '{market}' row {row} {column} is not a number ({value!r})")
+    bad = rows[nums["FairOdds"] <= 0]
+    issues += _issues("error", "values", workbook, bad.assign(column="FairOdds", value=bad["FairOdds"]),
+                      "{sheet}: '{market}' row {row} FairOdds {value} must be positive")
+    # 0 is the export's "not priced yet"; anything else has to be a real price
+    priced = nums["BookieOdds"] != 0
+    bad = rows[priced & (nums["BookieOdds"] <= 1)]
+    issues += _issues("error", "values", workbook, bad.assign(column="BookieOdds", value=bad["BookieOdds"]),
+                      "{sheet}: '{market}' row {row} BookieOdds {value} must be above 1 (or 0 if unpriced)")
+    implied = (nums["BookieOdds"] / nums["FairOdds"] - 1) * 100
+    bad = rows[priced & ((implied - nums["Edge %"]).abs() > EDGE_TOLERANCE)]
+    issues += _issues("warning", "values", workbook, bad.assign(column="Edge %", value=bad["Edge %"]),
+                      "{sheet}: '{market}' row {row} Edge % {value} doesn't match the odds")
+
+    # team column matches the side's team from the title
+    side_team = rows["sheet"].map(top.set_index("sheet")["home"]).where(
+        rows["side"] == "home", rows["sheet"].map(top.set_index("sheet")["away"]))
+    bad = rows[rows["Team"].astype(str).str.strip() != side_team]
+    issues += _issues("warning", "teams", workbook, bad.assign(column="Team", value=bad["Team"]),
+                      "{sheet}: '{market}' row {row} team {value!r} isn't the {side} side")
+    return issues
+
+
+# ————— upcoming_round_summary —————
+def check_stats(overall, venue, workbook=round_data.SUMMARY_FILE, fixtures=None):
+    """Problems in the Last-5 sheets; with `fixtures`, also each game's team coverage."""
+    issues = []
+    for name, df in ((round_data.SHEET_OVERALL, overall), (round_data.SHEET_VENUE, venue)):
+        missing = [c for c in STATS_COLUMNS if c not in df.columns]
+        if missing:
+            issues.append(_issue("error", "layout", workbook, f"{name}: missing columns {missing}",
+                                 sheet=name))
+            continue
+        rows = df.reset_index(drop=True).assign(sheet=name, row=lambda d: d.index + 2)
+        bad = rows[pd.to_datetime(rows["GameDate"], errors="coerce").isna()]
+        issues += _issues("error", "dtypes", workbook, bad.assign(column="GameDate", value=bad["GameDate"]),
+                          "{sheet}: row {row} GameDate is not a date ({value!r})")
+        for col, allowed in STATS_VALUES.items():
+            bad = rows[~rows[col].astype(str).str.strip().isin(allowed)]
+            issues += _issues("error", "values", workbook, bad.assign(column=col, value=bad[col]),
+                              "{sheet}: row {row} " + col + " should be one of " + "/".join(sorted(allowed))
+                              + ", got {value!r}")
+
+    if fixtures:
+        # the Teams tab shows an empty table and falls back to the city for the
+        # venue heading – worth knowing about, not worth blocking the round
+        sides = pd.DataFrame([(gm, info["home"], "home") for gm, info in fixtures.items()]
+                             + [(gm, info["away"], "away") for gm, info in fixtures.items()],
+                             columns=["market", "value", "side"])
+        for name, df in ((round_data.SHEET_OVERALL, overall), (round_data.SHEET_VENUE, venue)):
+            if "Team" not in df.columns:
+                continue        # already a layout error
+            bad = sides[~sides["value"].isin(df["Team"])].assign(sheet=name)
+            issues += _issues("warning", "coverage", workbook, bad,
+                              "{sheet}: no rows for {value} ({side} side of {market})")
+    return issues
+
+
+# ————— Whole round —————
+def validate(export_file=round_data.EXPORT_FILE, summary_file=round_data.SUMMARY_FILE):
+    """One report for the round: both workbooks plus the coverage between them."""
+    sheets = round_data.read_sheets(export_file)
+    issues = check_export(sheets, export_file)
+    fixtures = round_data.round_fixtures(sheets) if not any(
+        i["severity"] == "error" and i["check"] == "layout" for i in issues) else None
+    overall = pd.read_excel(summary_file, sheet_name=round_data.SHEET_OVERALL)
+    venue = pd.read_excel(summary_file, sheet_name=round_data.SHEET_VENUE)
+    issues += check_stats(overall, venue, summary_file, fixtures)
+
+    stats_checks = STATS_CHECKS if fixtures else [c for c in STATS_CHECKS if c != "coverage"]
+    out = report(export_file, issues, list(dict.fromkeys(EXPORT_CHECKS + stats_checks)))
+    out["workbooks"] = [os.path.basename(export_file), os.path.basename(summary_file)]
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Validate the round's export workbooks.")
+    ap.add_argument("--export", default=round_data.EXPORT_FILE)
+    ap.add_argument("--summary", default=round_data.SUMMARY_FILE)
+    ap.add_argument("--out", help="write the JSON report here (default: stdout)")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    rep = validate(args.export, args.summary)
+    text = json.dumps(rep, indent=1, default=str)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    status = "✅ valid" if rep["ok"] else "❌ invalid"
+    print(f"{status}: {rep['errors']} errors, {rep['warnings']} warnings "
+          f"({time.perf_counter() - t0:.2f}s)", file=sys.stderr)
+    sys.exit(0 if rep["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,19 @@
 import base64
 import os.path
 from email.mime.text import MIMEText
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from functools import lru_cache
+
+# the google client stack is slow to import – it's loaded on first send,
+# so building messages (and importing this module) stays cheap
 
 # Gmail API scope
 SCOPES = ['https://www.googleapis.com/auth/gmail.send']
 
-def send_email(recipient, subject, message_text):
+def get_credentials():
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     creds = None
 
     # Token stores user credentials between runs
@@ -23,16 +27,29 @@ def send_email(recipient, subject, message_text):
         else:
             flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
             creds = flow.run_local_server(port=0)
-        # Save the credentials for next time
-        with open('token.json', 'w') as token:
-            token.write(creds.to_json())
+        save_credentials(creds)
 
-    service = build('gmail', 'v1', credentials=creds)
+    return creds
 
+def save_credentials(creds):
+    # Save the credentials for next time (also after the client refreshes them mid-run)
+    with open('token.json', 'w') as token:
+        token.write(creds.to_json())
+
+@lru_cache(maxsize=1)
+def get_service():
+    from googleapiclient.discovery import build
+    # built once per process – the client refreshes the token itself when it expires
+    return build('gmail', 'v1', credentials=get_credentials())
+
+def create_message(recipient, subject, message_text):
     message = MIMEText(message_text)
     message['to'] = recipient
     message['subject'] = subject
-    raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
+    return {'raw': base64.urlsafe_b64encode(message.as_bytes()).decode()}
 
-    send_message = service.users().messages().send(userId="me", body={'raw': raw}).execute()
+def send_email(recipient, subject, message_text):
+    service = get_service()
+    body = create_message(recipient, subject, message_text)
+    send_message = service.users().messages().send(userId="me", body=body).execute()
     return send_message
@@ -1,15 +1,19 @@
 # team_stats_local.py
 
+import startup_profile
+startup_profile.start("localtesting")
+
 import streamlit as st
 import pandas as pd
-import os, io, base64
-from PIL import Image
+
+import round_data
+from rendering import load_logo_b64
+
+startup_profile.mark("imports")
 
 # ————— CONFIG —————
 EXPORT_FILE    = "Export.xlsx"
 SUMMARY_FILE   = "upcoming_round_summary.xlsx"
-SHEET_OVERALL  = "Overall_Last5"
-SHEET_VENUE    = "Venue_Last5"
 
 TICK, CROSS    = "✅", "❌"
 
@@ -24,23 +28,11 @@ VERT_BORDER   = "1px solid rgba(0,0,0,0.2)"
 HORIZ_BORDER  = "1px solid rgba(0,0,0,0.2)"
 # ——————————————————
 
-@st.cache_data
 def load_fixtures():
-    xls = pd.ExcelFile(EXPORT_FILE)
-    mapping = {}
-    for sheet in xls.sheet_names:
-        df0 = pd.read_excel(xls, sheet_name=sheet, header=None)
-        if df0.shape[1] > 1:
-            m = df0.iat[0,1]
-            if isinstance(m, str) and "VS" in m:
-                mapping[m.strip()] = sheet
-    return mapping
-
-@st.cache_data
+    return round_data.load_fixtures(EXPORT_FILE)
+
 def load_stats():
-    overall = pd.read_excel(SUMMARY_FILE, sheet_name=SHEET_OVERALL)
-    venue   = pd.read_excel(SUMMARY_FILE, sheet_name=SHEET_VENUE)
-    return overall, venue
+    return round_data.load_stats(SUMMARY_FILE)
 
 def res_icon(r):
     return TICK if str(r).upper().startswith("W") else CROSS
@@ -51,19 +43,6 @@ def cover_icon(v):
 def ou_icon(r):
     return ARROW_UP_HTML if str(r).lower().startswith("o") else ARROW_DN_HTML
 
-def img_to_b64(img):
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    return base64.b64encode(buf.getvalue()).decode()
-
-def load_logo_b64(team):
-    for ext in (".png", ".jpg", ".jpeg"):
-        fn = f"{team}{ext}"
-        if os.path.exists(fn):
-            img = Image.open(fn).resize((30,30))
-            return img_to_b64(img)
-    return None
-
 def make_table_html(df, *, add_divider=False, date_fmt="%d %b"):
     divider_css = f"border-right:{VERT_BORDER};" if add_divider else ""
     html = f'<table style="width:100%;border-collapse:collapse;{divider_css}"><tbody>'
@@ -89,7 +68,7 @@ def make_table_html(df, *, add_divider=False, date_fmt="%d %b"):
         ha = str(r.get("HomeAway","")).strip().lower()
         prefix = "<strong>VS</strong>&nbsp;" if ha == "home" else "<strong>@</strong>&nbsp;"
 
-        date_str = pd.to_datetime(r["GameDate"]).strftime(date_fmt)
+        date_str = pd.to_datetime(r["GameDate"]).strftime(date_fmt) if pd.notna(r["GameDate"]) else ""
 
         html += "<tr>"
         html += f'<td rowspan="2" style="{span_style}">{date_str}</td>'
@@ -151,8 +130,10 @@ def main():
         )
 
     # --- Last 5 at Venue ---
-    # determine stadium from the venue summary
-    stadium = venue[venue["Team"] == home]["Venue"].iloc[0]
+    # determine stadium from the venue summary (Export.xlsx has no city cell
+    # to fall back on when the home side is missing from it)
+    home_venue = venue.loc[venue["Team"] == home, "Venue"]
+    stadium = home_venue.iloc[0] if len(home_venue) else "Venue"
     st.subheader(f"Last 5 at {stadium}")
     left, spacer, right = st.columns([1,0.02,1])
     with left:
@@ -174,3 +155,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    startup_profile.finish()
@@ -0,0 +1,154 @@
+# ----------------------------------------------------
+# MARKET TABLE – compact typed model of the player-market rows
+#
+# One contiguous columnar table per round:
+#   codes  int16   (n_cat_cols, n)   – categorical game/market/side/team/player
+#                                      (int32 once a column passes 32767 categories)
+#   values float32 (n_num_cols, n)   – odds and edges
+# Rows are grouped by game, so table.game(name) is a zero-copy view of a
+# contiguous slice. Categories are shared between a table and its views.
+# ----------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+CATS = ["Game", "Sheet", "Market", "Side", "Row", "Team", "Player"]
+NUMS = ["FairOdds", "Odds", "Edge %", "Adj Edge %"]
+
+
+def code_dtype(n_categories):
+    """Smallest signed int that holds codes 0..n-1 plus -1 for missing."""
+    for dtype in (np.int16, np.int32):
+        if n_categories <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def to_float32(s):
+    """Numbers from a sheet column – tolerates '11%', '$2.80' and blanks."""
+    if s.dtype == object or pd.api.types.is_string_dtype(s):
+        s = s.astype(str).str.replace(r"[%$,\s]", "", regex=True)
+    return pd.to_numeric(s, errors="coerce").to_numpy(dtype=np.float32)
+
+
+class MarketTable:
+    def __init__(self, codes, categories, values, num_cols, offsets=None):
+        self.codes = codes
+        self.categories = categories      # {col: pd.Index}, shared with views
+        self.values = values
+        self.cat_cols = list(categories)
+        self.num_cols = list(num_cols)
+        self._cat_pos = {c: i for i, c in enumerate(self.cat_cols)}
+        self._num_pos = {c: i for i, c in enumerate(self.num_cols)}
+        self._offsets = offsets           # {first cat value: (start, stop)} or None
+
+    # ————— building —————
+    @classmethod
+    def from_frame(cls, df, cats=None, nums=None):
+        cats = [c for c in (cats or CATS) if c in df.columns]
+        nums = [c for c in (nums or NUMS) if c in df.columns]
+
+        categories, factorized = {}, []
+        for c in cats:
+            # appearance order keeps games in workbook order
+            f, categories[c] = pd.factorize(df[c], sort=False)
+            factorized.append(f)
+        # multi-season history can outgrow int16 (players) – never wrap codes
+        dtype = code_dtype(max((len(v) for v in categories.values()), default=0))
+        codes = np.empty((len(cats), len(df)), dtype=dtype)
+        for i, f in enumerate(factorized):
+            codes[i] = f
+        values = np.empty((len(nums), len(df)), dtype=np.float32)
+        for i, c in enumerate(nums):
+            values[i] = to_float32(df[c])
+
+        # group rows by the first categorical (Game) so each game is contiguous
+        offsets = None
+        if cats:
+            order = np.argsort(codes[0], kind="stable")
+            codes, values = codes[:, order], values[:, order]
+            bounds = np.searchsorted(codes[0], np.arange(len(categories[cats[0]]) + 1))
+            offsets = {g: (bounds[k], bounds[k + 1]) for k, g in enumerate(categories[cats[0]])}
+        return cls(np.ascontiguousarray(codes), categories, np.ascontiguousarray(values),
+                   nums, offsets)
+
+    # ————— access —————
+    def __len__(self):
+        return self.codes.shape[1]
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.values.nbytes
+
+    def num(self, col):
+        """float32 view of a numeric column."""
+        return self.values[self._num_pos[col]]
+
+    def code(self, col):
+        """View of a categorical column's codes (-1 = missing)."""
+        return self.codes[self._cat_pos[col]]
+
+    def cat(self, col):
+        return pd.Categorical.from_codes(self.code(col), self.categories[col])
+
+    def isin(self, col, items):
+        wanted = self.categories[col].get_indexer(list(items))
+        return np.isin(self.code(col), wanted[wanted >= 0])
+
+    def eq(self, col, item):
+        code = self.categories[col].get_indexer([item])[0]
+        # an unknown item matches nothing (not the -1 "missing" codes)
+        return self.code(col) == code if code >= 0 else np.zeros(len(self), dtype=bool)
+
+    # ————— slicing —————
+    def game(self, name):
+        """Zero-copy view of one game's rows."""
+        if self._offsets is None or name not in self._offsets:
+            return self.take(np.empty(0, dtype=np.int64))
+        a, b = self._offsets[name]
+        return MarketTable(self.codes[:, a:b], self.categories, self.values[:, a:b],
+                           self.num_cols, {name: (0, b - a)})
+
+    def take(self, idx):
+        """Rows by position or boolean mask (a copy, like numpy fancy indexing)."""
+        return MarketTable(self.codes[:, idx], self.categories, self.values[:, idx], self.num_cols)
+
+    def sort(self, col, descending=True):
+        v = self.num(col)
+        order = np.argsort(-v if descending else v, kind="stable")
+        # NaNs sort last either way
+        order = np.concatenate([order[~np.isnan(v[order])], order[np.isnan(v[order])]])
+        return self.take(order)
+
+    def filter(self, *, markets=None, odds_range=None, min_edge=None):
+        mask = np.ones(len(self), dtype=bool)
+        # None is "every market"; an empty selection is no markets
+        if markets is not None:
+            mask &= self.isin("Market", markets)
+        if odds_range is not None:
+            odds = self.num("Odds")
+            mask &= (odds >= odds_range[0]) & (odds <= odds_range[1])
+        if min_edge is not None:
+            mask &= self.num("Edge %") >= min_edge
+        return self.take(mask)
+
+    def best_by(self, keys, col, mask=None):
+        """Position of the max `col` row for each distinct `keys` combination."""
+        idx = np.arange(len(self)) if mask is None else np.flatnonzero(mask)
+        v = self.num(col)[idx]
+        idx = idx[~np.isnan(v)]
+        if not len(idx):
+            return idx
+        # by group, then best first – ties keep row order, like idxmax
+        order = np.lexsort([-self.num(col)[idx]] + [self.code(k)[idx] for k in reversed(keys)])
+        idx = idx[order]
+        group = np.stack([self.code(k)[idx] for k in keys])
+        first = np.ones(len(idx), dtype=bool)
+        first[1:] = (group[:, 1:] != group[:, :-1]).any(axis=0)
+        return idx[first]
+
+    # ————— output —————
+    def to_frame(self, cols=None):
+        """Plain DataFrame (categorical + float32 columns) for display/export – `cols` only, if given."""
+        cols = cols or self.cat_cols + self.num_cols
+        return pd.DataFrame({c: self.cat(c) if c in self._cat_pos else self.num(c) for c in cols})
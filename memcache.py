@@ -0,0 +1,185 @@
+# ----------------------------------------------------
+# MEMCACHE – in-process caches with a memory budget
+#
+#   frames = MemoryCache("frames", max_mb=256, ttl=3600)
+#   df = frames.get_or_build(key, lambda: expensive(key))
+#
+# Each cache is an LRU bounded by bytes (and optionally entry count and
+# age). Entry sizes are measured on insert: DataFrames by deep memory
+# usage, arrays by nbytes, strings/bytes by length, containers recursively.
+# Every cache registers itself, so report() / log_report() / the dashboard
+# admin panel can show hit rate and memory for all of them at once.
+# log_report() goes to the "memcache" logger; configuring its output is up
+# to the app.
+# ----------------------------------------------------
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# ————— CONFIG —————
+MB = 1024 * 1024
+# a cache's budget can be overridden per name: AFL_CACHE_MB_ROUND_DATA=512
+ENV_PREFIX   = "AFL_CACHE_MB_"
+LOG_EVERY    = float(os.environ.get("AFL_CACHE_LOG_SECONDS", 300))   # 0 = never
+# ——————————————————
+
+# usage reports are INFO records – shown wherever the app's logging config sends them
+log = logging.getLogger(__name__)
+
+_registry = {}            # name -> MemoryCache
+_last_log = time.monotonic()
+
+
+def sizeof(obj, _seen=None):
+    """Approximate bytes held by obj (shared objects are counted once)."""
+    _seen = set() if _seen is None else _seen
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, (str, bytes, bytearray)):
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(sizeof(k, _seen) + sizeof(v, _seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(sizeof(v, _seen) for v in obj)
+    if hasattr(obj, "nbytes"):                  # MarketTable and friends
+        return int(obj.nbytes)
+    if hasattr(obj, "__dict__"):
+        return sys.getsizeof(obj) + sizeof(vars(obj), _seen)
+    return sys.getsizeof(obj)
+
+
+class MemoryCache:
+    def __init__(self, name, max_mb=64, ttl=None, max_entries=None):
+        self.name = name
+        self.max_bytes = int(float(os.environ.get(ENV_PREFIX + name.upper(), max_mb)) * MB)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data = OrderedDict()      # key -> (value, size, stored_at)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = self.expired = self.oversize = 0
+        _registry[name] = self
+
+    # ————— lookups —————
+    def get(self, key, default=None, valid=None):
+        """
+        Cached value or `default`. Entries past their TTL, or for which
+        valid(value) is false (e.g. an older workbook version), are dropped.
+        """
+        _maybe_log()
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None:
+                value, size, at = hit
+                if self.ttl is not None and time.monotonic() - at > self.ttl:
+                    self._drop(key)
+                    self.expired += 1
+                elif valid is not None and not valid(value):
+                    self._drop(key)
+                else:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return default
+
+    def put(self, key, value, size=None):
+        size = sizeof(value) if size is None else size
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            if size > self.max_bytes:
+                # bigger than the whole budget: hand it back uncached
+                self.oversize += 1
+                log.warning("%s: %.1fMB entry exceeds the %.0fMB budget, not cached",
+                            self.name, size / MB, self.max_bytes / MB)
+                return value
+            self._data[key] = (value, size, time.monotonic())
+            self.bytes += size
+            while self.bytes > self.max_bytes or (
+                    self.max_entries and len(self._data) > self.max_entries):
+                old = next(iter(self._data))
+                self._drop(old)
+                self.evictions += 1
+                log.debug("%s: evicted %r", self.name, old)
+        return value
+
+    def get_or_build(self, key, build, valid=None):
+        value = self.get(key, _MISSING, valid)
+        if value is _MISSING:
+            value = self.put(key, build())
+        return value
+
+    def memoize(self, fn):
+        """Decorator – cache fn(*args) by its (hashable) arguments."""
+        def wrapper(*args):
+            return self.get_or_build((fn.__name__,) + args, lambda: fn(*args))
+        wrapper.__name__, wrapper.__doc__ = fn.__name__, fn.__doc__
+        wrapper.cache = self
+        return wrapper
+
+    def _drop(self, key):
+        _, size, _ = self._data.pop(key)
+        self.bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    # ————— reporting —————
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "cache": self.name,
+            "entries": len(self._data),
+            "MB": round(self.bytes / MB, 2),
+            "budget MB": round(self.max_bytes / MB, 1),
+            "hit rate": round(self.hits / lookups, 3) if lookups else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "oversize": self.oversize,
+        }
+
+
+_MISSING = object()
+
+
+def report():
+    """One stats dict per registered cache."""
+    return [c.stats() for c in _registry.values()]
+
+
+def log_report():
+    for s in report():
+        rate = "-" if s["hit rate"] is None else f"{s['hit rate']:.0%}"
+        log.info("%-12s %4d entries %8.2f/%.0fMB  hit %s  evicted %d  expired %d",
+                 s["cache"], s["entries"], s["MB"], s["budget MB"], rate,
+                 s["evictions"], s["expired"])
+
+
+def _maybe_log():
+    global _last_log
+    if LOG_EVERY and time.monotonic() - _last_log > LOG_EVERY:
+        _last_log = time.monotonic()
+        log_report()
@@ -0,0 +1,164 @@
+# ----------------------------------------------------
+# PLAYER INDEX
+# Normalised player names -> every (game, market, side, row) they appear in,
+# with prefix & fuzzy lookup. Built from the round_data long table and
+# updated per game, so a re-export only re-indexes the sheets that changed.
+# ----------------------------------------------------
+
+import bisect
+import difflib
+import re
+import threading
+import unicodedata
+
+import pandas as pd
+
+KEY_COLS = ["Game", "Market", "Side", "Row", "Player"]
+
+
+def normalise(name):
+    """'Hudson O'Keeffe ' -> 'hudson okeeffe' (accents, case, punctuation)."""
+    s = unicodedata.normalize("NFKD", str(name))
+    s = "".join(ch for ch in s if not unicodedata.combining(ch)).lower()
+    s = re.sub(r"[^a-z0-9 ]+", "", s)
+    return " ".join(s.split())
+
+
+class PlayerIndex:
+    def __init__(self):
+        self.version = None
+        self._entries = {}    # norm name -> {(game, market, side, row), ...}
+        self._display = {}    # norm name -> name as it appears in the sheet
+        self._spelled = {}    # norm name -> {game: every spelling in that game's rows}
+        self._games   = {}    # game -> (digest, {norm names})
+        self._tokens  = []    # sorted (token, norm name) – surname prefix search
+        # shared across Streamlit sessions, so guard against concurrent updates
+        self._lock = threading.RLock()
+
+    # ————— building —————
+    def update(self, round_df, version=None):
+        """
+        Bring the index in line with `round_df`. Games whose rows hash the
+        same as last time are skipped; a repeat call for the same `version`
+        is a no-op.
+        """
+        if version is not None and version == self.version:
+            return
+        with self._lock:
+            self._update(round_df, version)
+
+    def _update(self, round_df, version):
+        df = round_df[KEY_COLS]
+        # one hash pass over the whole table, summed per game
+        digests = pd.util.hash_pandas_object(df, index=False).groupby(df["Game"].to_numpy()).sum()
+        seen = set()
+        for game, digest in digests.items():
+            seen.add(game)
+            if game in self._games and self._games[game][0] == digest:
+                continue
+            self._drop_game(game)
+            self._add_game(game, df[df["Game"] == game], digest)
+        for game in set(self._games) - seen:
+            self._drop_game(game)
+        self.version = version
+
+    def _add_game(self, game, g, digest):
+        names = set()
+        for market, side, row, player in zip(g["Market"], g["Side"], g["Row"], g["Player"]):
+            key = normalise(player)
+            if not key:
+                continue
+            if key not in self._entries:
+                self._entries[key] = set()
+                self._display[key] = player
+                for tok in key.split():
+                    bisect.insort(self._tokens, (tok, key))
+            self._entries[key].add((game, market, side, int(row)))
+            self._spelled.setdefault(key, {}).setdefault(game, set()).add(player)
+            names.add(key)
+        self._games[game] = (digest, names)
+
+    def _drop_game(self, game):
+        if game not in self._games:
+            return
+        _, names = self._games.pop(game)
+        for key in names:
+            hits = self._entries[key]
+            hits.difference_update({h for h in hits if h[0] == game})
+            self._spelled[key].pop(game, None)
+            if not hits:
+                del self._entries[key], self._display[key], self._spelled[key]
+                for tok in key.split():
+                    i = bisect.bisect_left(self._tokens, (tok, key))
+                    if i < len(self._tokens) and self._tokens[i] == (tok, key):
+                        del self._tokens[i]
+
+    # ————— lookup —————
+    def __len__(self):
+        return len(self._entries)
+
+    def entries(self, name):
+        """Sorted (game, market, side, row) hits for one player."""
+        with self._lock:
+            return sorted(self._entries.get(normalise(name), ()))
+
+    def spellings(self, name):
+        """Every way the sheets spell this player ('Tom De Koning', 'Tom de Koning')."""
+        with self._lock:
+            games = self._spelled.get(normalise(name), {})
+            return sorted(set().union(*games.values())) if games else []
+
+    def prefix(self, query, limit=10):
+        """Players with any name token starting with `query` (e.g. 'crip')."""
+        q = normalise(query)
+        if not q:
+            return []
+        first, _, rest = q.partition(" ")
+        out = []
+        i = bisect.bisect_left(self._tokens, (first, ""))
+        while i < len(self._tokens) and self._tokens[i][0].startswith(first):
+            key = self._tokens[i][1]
+            # multi-word queries must match the full name from that token on
+            if (not rest or q in key) and key not in out:
+                out.append(key)
+                if len(out) >= limit:
+                    break
+            i += 1
+        return [self._display[k] for k in out]
+
+    def fuzzy(self, query, limit=5, cutoff=0.6):
+        """
+        Close matches for a typo. A one-word query ('crips') is scored against
+        each name token as well, so a misspelt surname still finds the player.
+        """
+        q = normalise(query)
+        if not q:
+            return []
+        # names with a token sharing the query's first letter first; a typo in
+        # the first letter ('krisp') only finds anything in the full scan
+        lo = bisect.bisect_left(self._tokens, (q[0], ""))
+        hi = bisect.bisect_left(self._tokens, (chr(ord(q[0]) + 1), ""))
+        best = self._score(q, self._tokens[lo:hi], cutoff) or self._score(q, self._tokens, cutoff)
+        keys = sorted(best, key=lambda k: (-best[k], k))[:limit]
+        return [self._display[k] for k in keys]
+
+    @staticmethod
+    def _score(q, tokens, cutoff):
+        """{norm name: best ratio} over (token, name) pairs at or above `cutoff`."""
+        one_word = " " not in q
+        best = {}
+        m = difflib.SequenceMatcher()
+        m.set_seq2(q)
+        for tok, key in tokens:
+            for text in ((tok, key) if one_word else (key,)):
+                m.set_seq1(text)
+                if m.real_quick_ratio() >= cutoff and m.quick_ratio() >= cutoff:
+                    score = m.ratio()
+                    if score >= cutoff and score > best.get(key, 0):
+                        best[key] = score
+        return best
+
+    def search(self, query, limit=10):
+        """Prefix matches, falling back to fuzzy matches when a typo finds nothing."""
+        with self._lock:
+            return self.prefix(query, limit) or self.fuzzy(query, limit)
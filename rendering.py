@@ -0,0 +1,112 @@
+# ----------------------------------------------------
+# RENDERING – table builders shared by the dashboard and the static export
+# ----------------------------------------------------
+
+import os, io, base64
+
+import pandas as pd
+
+from memcache import MemoryCache
+
+_logos = MemoryCache("logos", max_mb=4)
+
+
+def img_to_b64(img):
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return base64.b64encode(buf.getvalue()).decode()
+
+@_logos.memoize
+def load_logo_b64(team):
+    from PIL import Image   # only the Teams views need it
+    for ext in (".png", ".jpg", ".jpeg"):
+        fn = f"{team}{ext}"
+        if os.path.exists(fn):
+            return img_to_b64(Image.open(fn).resize((30,30)))
+    return None
+
+def make_table_html(df, *, add_divider=False, date_fmt="%d %b", headers=None):
+    V = "1px solid rgba(0,0,0,0.2)"
+    H = "1px solid rgba(0,0,0,0.2)"
+    divider_css = f"border-right:{V};" if add_divider else ""
+    # add font‐family and size to match pandas tables:
+    html = f'<table style="width:100%;border-collapse:collapse;font-family:inherit;font-size:14px;{divider_css}">'
+
+    span = f"border-top:{H};border-bottom:{H};border-left:{V};border-right:{V};padding:4px;vertical-align:middle"
+    top  = f"border-top:{H};border-left:{V};border-right:{V};border-bottom:none;padding:4px;text-align:center"
+    bot  = f"border-left:{V};border-right:{V};border-top:none;border-bottom:{H};padding:4px;text-align:center"
+
+    if headers:
+        # give your <th> the same background & boldness as pandas header cells
+        header_span = span + ";background-color:#F0F4FF;font-weight:bold"
+        html += "<thead><tr>"
+        for h in headers:
+            html += f'<th style="{header_span}">{h}</th>'
+        html += "</tr></thead>"
+
+    html += "<tbody>"
+    for _, r in df.iterrows():
+        ha = str(r.get("HomeAway","")).lower()
+        prefix = "<strong>VS</strong>&nbsp;" if ha=="home" else "<strong>@</strong>&nbsp;"
+        d = pd.to_datetime(r["GameDate"]).strftime(date_fmt) if pd.notna(r["GameDate"]) else ""
+
+        html += "<tr>"
+        html += f'<td rowspan="2" style="{span}">{d}</td>'
+
+        b64 = load_logo_b64(r["Opponent"])
+        if b64:
+            html += (
+                f'<td rowspan="2" style="{span}">'
+                f'{prefix}<img src="data:image/png;base64,{b64}" width="30" height="30"/>'
+                "</td>"
+            )
+        else:
+            html += f'<td rowspan="2" style="{span}">{prefix}{r["Opponent"]}</td>'
+
+        html += f'<td style="{top}">{r["Score"]}</td>'
+        html += f'<td style="{top}">{r["Line"]}</td>'
+        html += f'<td style="{top}">{r["O/U"]}</td>'
+        html += "</tr>"
+
+        html += (
+            "<tr>"
+            f'<td style="{bot}">{"✅" if r["Res"]=="W" else "❌"}</td>'
+            f'<td style="{bot}">{"✅" if r["Covered"]=="Y" else "❌"}</td>'
+            f'<td style="{bot}">{"&#9650;" if r["O/U Res"].lower()=="over" else "&#9660;"}</td>'
+            "</tr>"
+        )
+    html += "</tbody></table>"
+    return html
+
+
+def style_table(df, odds_col):
+    def hl(r):
+        # r["Edge %"] is already a float, so just use it directly
+        e = r["Edge %"]
+        color = "#e9f9ec" if e > 0 else "#faeaea"
+        return [f"background-color: {color}"] * len(r)
+
+    return (
+        df.style
+          .format({
+              odds_col:     lambda x: f"${x:.2f}" if pd.notnull(x) else x,
+              "Edge %":     lambda x: f"{x:.1f}%",
+              "Adj Edge %": lambda x: f"{x:.1f}%"
+          })
+          .set_table_styles([
+              {"selector": "th", "props": [("background-color", "#F0F4FF"), ("font-weight","bold")]}
+          ])
+          .apply(hl, axis=1)
+    )
+
+def prep(df):
+    """
+    Rename BookieOdds→Odds, pick just the four columns, and
+    hand off to style_table for colouring & formatting.
+    """
+    df2 = (
+        df
+        .rename(columns={"BookieOdds": "Odds"})
+        [["Player", "Odds", "Edge %", "Adj Edge %"]]
+    )
+    return style_table(df2, odds_col="Odds")
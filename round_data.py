@@ -0,0 +1,377 @@
+# ----------------------------------------------------
+# ROUND DATA – the one data-access layer for every entry point
+# (dashboard, testing pages, Bets.py, API, exports).
+#
+# Workbooks are parsed once per version (mtime + size) and shared:
+#   - in-process: one entry per workbook, replaced when the file changes,
+#     inside a memory budget (memcache) – evicted entries reload from disk
+#   - across processes: a pickle per version in CACHE_DIR, so whichever page
+#     on the host asks first pays for the Excel parse and the rest load it
+# The round and stats are validated (export_validator) as part of that one
+# parse: a bad workbook raises InvalidExport, and the failure is cached for
+# its version too, so reruns don't re-parse it until the file changes.
+# Everything handed out is shared – treat it as read-only (.copy() first).
+#
+# Deployment mode: with AFL_SNAPSHOT_DIR set, the round and stats come from
+# the snapshot a loader process published (round_snapshot.py) instead of
+# the workbooks – replicas map it rather than parsing Excel themselves.
+# ----------------------------------------------------
+
+import glob
+import hashlib
+import os
+import pickle
+import threading
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from market_table import MarketTable
+from memcache import MemoryCache
+
+# ————— CONFIG —————
+EXPORT_FILE   = "Export_simple.xlsx"
+SUMMARY_FILE  = "upcoming_round_summary.xlsx"
+SHEET_OVERALL = "Overall_Last5"
+SHEET_VENUE   = "Venue_Last5"
+ROUND         = 24
+
+# set AFL_CACHE_DIR="" to keep the cache in-process only
+CACHE_DIR = os.environ.get("AFL_CACHE_DIR", ".round_cache")
+CACHE_MB  = 256         # in-process budget; least recently used workbooks go first
+SNAPSHOT_DIR = os.environ.get("AFL_SNAPSHOT_DIR", "")
+
+GOAL_MARKETS     = ["Anytime Goalscorer", "2+ Goalscorer", "3+ Goalscorer"]
+DISPOSAL_MARKETS = ["15+ Disposals", "20+ Disposals", "25+ Disposals", "30+ Disposals"]
+MARKETS          = GOAL_MARKETS + DISPOSAL_MARKETS
+
+BLOCK_ROWS = 5          # players per block
+COLUMNS    = ["Team", "Player", "FairOdds", "BookieOdds", "Edge %", "Adj Edge %"]
+NUMERIC    = ["FairOdds", "BookieOdds", "Edge %", "Adj Edge %"]
+# ——————————————————
+
+
+def workbook_version(path=EXPORT_FILE):
+    """Cheap fingerprint of the workbook – changes whenever it's re-exported."""
+    s = os.stat(path)
+    return (s.st_mtime_ns, s.st_size)
+
+
+def _snapshot(path):
+    """The published snapshot if we're in deployment mode and it has this workbook."""
+    if not SNAPSHOT_DIR:
+        return None
+    import round_snapshot
+    snap = round_snapshot.current(SNAPSHOT_DIR)
+    return snap if snap is not None and snap.source_version(path) else None
+
+
+def data_version(path=EXPORT_FILE):
+    """
+    Version of the data served for a workbook: the published snapshot's copy
+    in deployment mode, otherwise the file itself. Use this to key caches.
+    """
+    snap = _snapshot(path)
+    return snap.source_version(path) if snap else workbook_version(path)
+
+
+def read_sheets(path=EXPORT_FILE):
+    # one open of the file, every sheet at once
+    return pd.read_excel(path, sheet_name=None, header=None)
+
+
+# ————— Versioned cache —————
+_cache = MemoryCache("round_data", max_mb=CACHE_MB)   # (kind, path) -> (version, value)
+_locks = defaultdict(threading.Lock)   # one parse at a time per (kind, path)
+
+
+class _Failed:
+    """Cached stand-in for a build that raised – re-raised until the version changes."""
+    def __init__(self, exc):
+        self.exc = exc
+        self.nbytes = 0
+
+
+def _disk_path(kind, path, version):
+    key = hashlib.sha1(path.encode()).hexdigest()[:12]
+    stamp = "-".join(str(part) for v in version for part in v)
+    return os.path.join(CACHE_DIR, f"{key}-{kind}-{stamp}.pkl")
+
+
+def _disk_get(kind, path, version):
+    if not CACHE_DIR:
+        return None
+    try:
+        with open(_disk_path(kind, path, version), "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def _disk_put(kind, path, version, value):
+    if not CACHE_DIR:
+        return
+    fn = _disk_path(kind, path, version)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{fn}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, fn)
+        # drop older versions of the same workbook
+        for old in glob.glob(fn.rsplit(f"-{kind}-", 1)[0] + f"-{kind}-*.pkl"):
+            if old != fn:
+                os.remove(old)
+    except OSError:
+        pass    # a read-only disk just means no cross-process sharing
+
+
+def cached(kind, path, build, *, disk=False, depends=(), salt=0):
+    """
+    Return build(path), computed at most once per workbook version.
+    `depends` are other files the build reads – a new version of any of
+    them rebuilds too (a missing one just counts as its own version).
+    `salt` is the version of the build itself (e.g. the validator's), so
+    results cached by an older build – on disk too – aren't reused.
+    `disk=True` also shares the result with other processes on the host.
+    A build that raises is also remembered for the version: the same
+    exception is raised again without rebuilding.
+    """
+    path = os.path.abspath(path)
+    version = (workbook_version(path),) + tuple(
+        workbook_version(d) if os.path.exists(d) else (0, 0) for d in depends) + ((salt,),)
+    valid = lambda h: h[0] == version
+    # hits don't wait on the per-workbook lock – only a miss (one parse) does
+    hit = _cache.get((kind, path), valid=valid)
+    if hit is None:
+        with _locks[(kind, path)]:
+            hit = _cache.get((kind, path), valid=valid)    # built while we waited?
+            if hit is None:
+                value = _disk_get(kind, path, version) if disk else None
+                if value is None:
+                    try:
+                        value = build(path)
+                    except Exception as e:
+                        _cache.put((kind, path), (version, _Failed(e)))
+                        raise
+                    if disk:
+                        _disk_put(kind, path, version, value)
+                _cache.put((kind, path), (version, value))
+                return value
+    if isinstance(hit[1], _Failed):
+        raise hit[1].exc
+    return hit[1]
+
+
+def read_workbook(path=EXPORT_FILE):
+    """{sheet: raw frame} for every sheet, header=None – cached per version."""
+    return cached("sheets", path, read_sheets, disk=True)
+
+
+def fixture_title(raw):
+    """
+    'Home VS Away' from the top of a sheet. Export_simple keeps it in A1;
+    Export / ExportDisposals have the round in A1 and the fixture in B1.
+    """
+    if raw.empty:
+        return None
+    for col in range(min(2, raw.shape[1])):
+        v = raw.iat[0, col]
+        if isinstance(v, str) and "VS" in v:
+            return v.strip()
+    return None
+
+
+def load_fixtures(path=EXPORT_FILE):
+    """{fixture title: sheet name} for any of the export workbooks."""
+    def build(p):
+        return {t: sheet for sheet, raw in read_workbook(p).items()
+                if (t := fixture_title(raw))}
+    return cached("fixtures", path, build)
+
+
+def game_info(raw, sheet):
+    """Fixture details from the top of a game sheet (A1 title, A2 date, B2 city)."""
+    gm = raw.iat[0, 0].strip()
+    home, away = [x.strip() for x in gm.split("VS")]
+    d  = raw.iat[1, 0] if raw.shape[0] > 1 else None
+    ct = str(raw.iat[1, 1]).strip() if raw.shape[0] > 1 and raw.shape[1] > 1 else ""
+    return {
+        "sheet": sheet,
+        "round": ROUND,
+        "home": home,
+        "away": away,
+        "date": pd.to_datetime(d).date() if pd.notnull(d) else None,
+        # always display whatever is in the Excel cell (e.g. “Marvel”)
+        "city": ct,
+        # but if that cell says “Marvel”, force the weather lookup to Melbourne,AU
+        "weather_city": "Melbourne,AU" if ct.lower() == "marvel" else f"{ct},AU",
+    }
+
+
+def _is_game_sheet(raw):
+    if raw.empty:
+        return False
+    title = raw.iat[0, 0]
+    return isinstance(title, str) and "VS" in title
+
+
+def round_fixtures(sheets):
+    """{fixture title: game_info} for every game sheet, in workbook order."""
+    return {
+        raw.iat[0, 0].strip(): game_info(raw, sheet)
+        for sheet, raw in sheets.items() if _is_game_sheet(raw)
+    }
+
+
+def sheet_markets(raw, game):
+    """All market blocks of one sheet as a long frame."""
+    col0 = raw[0].to_numpy(dtype=object)
+    label_rows = np.flatnonzero(pd.Series(col0).isin(MARKETS).to_numpy())
+    if not len(label_rows):
+        return pd.DataFrame()
+
+    # data rows sit two below each label (label, header, 5 players)
+    take = label_rows[:, None] + 2 + np.arange(BLOCK_ROWS)
+    valid = take < len(raw)
+    take = np.where(valid, take, 0)
+
+    labels = col0[label_rows]
+    # first block of a market is the home team, second the away team
+    occurrence = pd.Series(labels).groupby(labels).cumcount().to_numpy()
+
+    vals = raw.iloc[take.ravel(), :len(COLUMNS)].to_numpy(dtype=object)
+    df = pd.DataFrame(vals, columns=COLUMNS)
+    df.insert(0, "Game", game)
+    df.insert(1, "Market", np.repeat(labels, BLOCK_ROWS))
+    df.insert(2, "Side", np.repeat(np.where(occurrence == 0, "home", "away"), BLOCK_ROWS))
+    df.insert(3, "Row", np.tile(np.arange(BLOCK_ROWS), len(label_rows)))
+    df = df[valid.ravel() & (np.repeat(occurrence, BLOCK_ROWS) < 2)]
+    return df.dropna(subset=["Player"])
+
+
+def round_markets(sheets):
+    """
+    Long table of every (game, market, side, player) in the round, built
+    from the {sheet: raw frame} dict returned by read_sheets().
+    """
+    frames = []
+    for sheet, raw in sheets.items():
+        if not _is_game_sheet(raw):
+            continue
+        df = sheet_markets(raw, raw.iat[0, 0].strip())
+        if not df.empty:
+            df.insert(1, "Sheet", sheet)
+            frames.append(df)
+
+    if not frames:
+        return pd.DataFrame(columns=["Game", "Sheet", "Market", "Side", "Row"] + COLUMNS)
+
+    out = pd.concat(frames, ignore_index=True)
+    for c in NUMERIC:
+        out[c] = pd.to_numeric(out[c], errors="coerce")
+    out["Team"]   = out["Team"].astype(str).str.strip()
+    out["Player"] = out["Player"].astype(str).str.strip()
+    return out.rename(columns={"BookieOdds": "Odds"})
+
+
+# ————— Validation —————
+_reports = {}            # abspath -> last validation report
+
+
+def _validator():
+    import export_validator      # imports round_data itself
+    return export_validator
+
+
+def _validate(path, issues, checks):
+    """Raise InvalidExport if any issue is an error; warnings are kept for validation()."""
+    v = _validator()
+    report = v.report(path, issues, checks)
+    _reports[os.path.abspath(path)] = report
+    if not report["ok"]:
+        raise v.InvalidExport(report)
+
+
+def validation(path=EXPORT_FILE):
+    """The validation report from the last parse of a workbook (None if not parsed here)."""
+    return _reports.get(os.path.abspath(path))
+
+
+def load_round(path=EXPORT_FILE, *, snapshot=True):
+    """
+    (fixtures, markets) from the cached workbook – built once per version.
+    snapshot=False always reads the workbook (the snapshot publisher).
+    """
+    snap = _snapshot(path) if snapshot else None
+    if snap:
+        return snap.fixtures, snap.markets
+
+    def build(p):
+        sheets = read_workbook(p)
+        v = _validator()
+        _validate(p, v.check_export(sheets, p), v.EXPORT_CHECKS)
+        return round_fixtures(sheets), round_markets(sheets)
+    return cached("round", path, build)
+
+
+def load_round_markets(path=EXPORT_FILE):
+    return load_round(path)[1]
+
+
+def load_game_info(path=EXPORT_FILE):
+    """{fixture title: game_info} – from a snapshot without building its markets frame."""
+    snap = _snapshot(path)
+    if snap:
+        return snap.fixtures
+    return load_round(path)[0]
+
+
+def load_stats(path=SUMMARY_FILE, *, snapshot=True, export=None):
+    """
+    (overall, venue) Last-5 frames. Team coverage is checked against the
+    fixtures in `export` (default: the Export_simple next to the summary);
+    it's skipped when that workbook is missing or itself invalid.
+    """
+    snap = _snapshot(path) if snapshot else None
+    if snap:
+        return snap.overall, snap.venue
+
+    export = os.path.abspath(export or os.path.join(os.path.dirname(os.path.abspath(path)), EXPORT_FILE))
+
+    def build(p):
+        overall = pd.read_excel(p, sheet_name=SHEET_OVERALL)
+        venue   = pd.read_excel(p, sheet_name=SHEET_VENUE)
+        v = _validator()
+        try:
+            fixtures = load_round(export, snapshot=False)[0]
+        except (OSError, v.InvalidExport):
+            fixtures = None      # an invalid export reports its own errors
+        checks = v.STATS_CHECKS if fixtures else [c for c in v.STATS_CHECKS if c != "coverage"]
+        _validate(p, v.check_stats(overall, venue, p, fixtures), checks)
+        return overall, venue
+    return cached("stats", path, build, disk=True, depends=(export,), salt=_validator().VERSION)
+
+
+def load_market_table(path=EXPORT_FILE, *, snapshot=True):
+    """The round as a compact typed MarketTable – built once per version."""
+    snap = _snapshot(path) if snapshot else None
+    if snap:
+        return snap.table
+    return cached("table", path,
+                  lambda p: MarketTable.from_frame(load_round(p, snapshot=False)[1]))
+
+
+def filter_markets(table, *, markets=None, odds_range=None, min_edge=None,
+                   sort_by="Edge %", top=None):
+    """
+    Vectorised filter/sort over the round (used by Best of Round). Takes the
+    MarketTable, or a round DataFrame which is converted first.
+    """
+    if isinstance(table, pd.DataFrame):
+        table = MarketTable.from_frame(table)
+    out = table.filter(markets=markets, odds_range=odds_range, min_edge=min_edge).sort(sort_by)
+    if top:
+        out = out.take(slice(0, top))
+    return out.to_frame()
@@ -0,0 +1,219 @@
+# ----------------------------------------------------
+# ROUND NOTIFIER – email subscribers when a new export changes the value
+#
+#   python round_notifier.py --recipients subscribers.txt --watch
+#   python round_notifier.py --recipients subscribers.txt --dry-run
+#
+# Each new Export_simple.xlsx is diffed against the last snapshot with keyed
+# joins on (Game, Market, Side, Player): new games, edges that crossed the
+# threshold, and price moves. The diff is rendered into one digest and
+# queued through bulk_sender/gmail_sender. Nothing changed -> nothing sent.
+# ----------------------------------------------------
+
+import argparse
+import hashlib
+import os
+import pickle
+import time
+
+import round_data
+from export_validator import InvalidExport
+
+# ————— CONFIG —————
+SNAPSHOT_FILE  = os.path.join("snapshots", "last_round.pkl")
+EDGE_THRESHOLD = 10.0     # Edge % worth shouting about
+PRICE_MOVE     = 0.05     # 5% change in bookie odds
+POLL_SECONDS   = 30
+KEY            = ["Game", "Market", "Side", "Player"]
+# ——————————————————
+
+
+# ————— Snapshots —————
+def load_snapshot(path=SNAPSHOT_FILE):
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def save_snapshot(snap, path=SNAPSHOT_FILE):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(snap, f)
+    os.replace(tmp, path)
+
+
+def take_snapshot(path=round_data.EXPORT_FILE):
+    fixtures, markets = round_data.load_round(path)
+    return {
+        "version": round_data.workbook_version(path),
+        "fixtures": fixtures,
+        "markets": markets[KEY + ["Team", "Odds", "Edge %"]],
+    }
+
+
+# ————— Diff —————
+def diff_rounds(prev, curr, *, edge_threshold=EDGE_THRESHOLD, price_move=PRICE_MOVE):
+    """
+    Structured diff between two snapshots:
+      new_games  – fixtures that weren't in the previous export
+      crossed    – rows now at/above the edge threshold that weren't before
+      moves      – rows whose bookie odds moved by at least `price_move`
+                   (priced both times – 0 odds mean unpriced)
+    The first export (prev=None) reports every game as new.
+    """
+    prev_games = set(prev["fixtures"]) if prev else set()
+    new_games = [gm for gm in curr["fixtures"] if gm not in prev_games]
+
+    cur = curr["markets"]
+    old = prev["markets"] if prev else cur.iloc[0:0]
+
+    m = cur.merge(old[KEY + ["Odds", "Edge %"]], on=KEY, how="left", suffixes=("", " prev"))
+    existing = m["Game"].isin(prev_games).to_numpy()
+
+    now_over = (m["Edge %"] >= edge_threshold).to_numpy()
+    was_over = (m["Edge % prev"] >= edge_threshold).to_numpy()
+    crossed = m[existing & now_over & ~was_over]
+
+    # 0 is the export's "unpriced" – a market being priced or pulled isn't a
+    # price move (newly priced value still shows up under `crossed`)
+    priced = ((m["Odds"] > 0) & (m["Odds prev"] > 0)).to_numpy()
+    move = (m["Odds"] / m["Odds prev"] - 1).abs()
+    moves = m[existing & priced & (move >= price_move).to_numpy()].assign(Move=move)
+
+    new_rows = cur[cur["Game"].isin(new_games) & (cur["Edge %"] >= edge_threshold)]
+
+    return {
+        "new_games": new_games,
+        "new_game_edges": new_rows.sort_values("Edge %", ascending=False),
+        "crossed": crossed.sort_values("Edge %", ascending=False),
+        "moves": moves.sort_values("Move", ascending=False),
+    }
+
+
+def is_empty(diff):
+    return not diff["new_games"] and diff["crossed"].empty and diff["moves"].empty
+
+
+# ————— Digest —————
+def _line(r):
+    return f"  • {r['Player']} ({r['Team']}) – {r['Market']} @ ${r['Odds']:.2f}, edge {r['Edge %']:.1f}%"
+
+
+def render_digest(diff, fixtures, *, edge_threshold=EDGE_THRESHOLD):
+    parts = [f"Round {round_data.ROUND} update from The Model", ""]
+
+    if diff["new_games"]:
+        parts.append("🆕 New games")
+        for gm in diff["new_games"]:
+            info = fixtures[gm]
+            when = f"{info['date']:%a %d %b}" if info.get("date") else ""
+            parts.append(f"  {gm} – {when} · {info['city']}")
+            for _, r in diff["new_game_edges"][diff["new_game_edges"]["Game"] == gm].head(5).iterrows():
+                parts.append(_line(r))
+        parts.append("")
+
+    if not diff["crossed"].empty:
+        parts.append(f"🎯 Now over {edge_threshold:.0f}% edge")
+        for gm, g in diff["crossed"].groupby("Game", sort=False):
+            parts.append(f"  {gm}")
+            parts += [_line(r) for _, r in g.iterrows()]
+        parts.append("")
+
+    if not diff["moves"].empty:
+        parts.append("📈 Price moves")
+        for _, r in diff["moves"].head(20).iterrows():
+            arrow = "▲" if r["Odds"] > r["Odds prev"] else "▼"
+            parts.append(f"  • {r['Player']} – {r['Market']} ({r['Game']}): "
+                         f"${r['Odds prev']:.2f} → ${r['Odds']:.2f} {arrow}")
+        parts.append("")
+
+    parts += ["Full dashboard: https://www.patreon.com/The_Model", "", "– The Model"]
+    return "\n".join(parts)
+
+
+# ————— Pipeline —————
+def run_once(recipients, *, export_file=round_data.EXPORT_FILE, snapshot_file=SNAPSHOT_FILE,
+             dry_run=False, transport=None, edge_threshold=EDGE_THRESHOLD, price_move=PRICE_MOVE):
+    """Diff the current export against the last snapshot and send the digest if non-empty."""
+    prev = load_snapshot(snapshot_file)
+    if prev and prev["version"] == round_data.workbook_version(export_file):
+        return None
+
+    curr = take_snapshot(export_file)
+    diff = diff_rounds(prev, curr, edge_threshold=edge_threshold, price_move=price_move)
+    if is_empty(diff):
+        save_snapshot(curr, snapshot_file)
+        return diff
+
+    text = render_digest(diff, curr["fixtures"], edge_threshold=edge_threshold)
+    subject = f"🔔 Round {round_data.ROUND}: " + (
+        f"{len(diff['new_games'])} new games" if diff["new_games"] else "new value on the board")
+
+    if dry_run:
+        print(subject, "\n", text, sep="")
+        return diff
+
+    import bulk_sender
+    # campaign name is tied to the export, so a crashed send resumes instead of repeating
+    campaign = "digest-" + hashlib.sha1(repr(curr["version"]).encode()).hexdigest()[:12]
+    result = bulk_sender.send_bulk(recipients, subject, text, campaign=campaign, transport=transport)
+    print(f"✅ Digest sent to {result['sent']} ({result['skipped']} already had it, "
+          f"{len(result['failed'])} failed)")
+    if result["failed"]:
+        # keep the old snapshot: the next run sees the same version, rebuilds the
+        # same digest and the campaign log sends it only to whoever missed it
+        print("⚠️ Snapshot not saved – re-run to retry the failed recipients")
+        return diff
+    save_snapshot(curr, snapshot_file)
+    return diff
+
+
+def watch(recipients, *, export_file=round_data.EXPORT_FILE, poll=POLL_SECONDS, **kw):
+    """Poll for new exports; wait for the file to stop changing before diffing it."""
+    last = handled = None
+    while True:
+        try:
+            version = round_data.workbook_version(export_file)
+        except FileNotFoundError:
+            version = None
+        if version is not None and version == last and version != handled:
+            try:
+                run_once(recipients, export_file=export_file, **kw)
+                handled = version
+            except InvalidExport as e:
+                # a bad export is skipped until the next one lands
+                handled = version
+                print(f"❌ Skipped invalid export: {e}")
+            except Exception as e:
+                # a half-written export – try again on the next poll
+                print(f"⚠️ Digest failed: {e}")
+        last = version
+        time.sleep(poll)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Email a digest when a new export changes the round.")
+    ap.add_argument("--recipients", required=True, help="text file, one address per line")
+    ap.add_argument("--export", default=round_data.EXPORT_FILE)
+    ap.add_argument("--snapshot", default=SNAPSHOT_FILE)
+    ap.add_argument("--threshold", type=float, default=EDGE_THRESHOLD, help="edge %% to alert on")
+    ap.add_argument("--price-move", type=float, default=PRICE_MOVE, help="fractional odds move to alert on")
+    ap.add_argument("--watch", action="store_true", help=f"keep polling every {POLL_SECONDS}s")
+    ap.add_argument("--dry-run", action="store_true", help="print the digest instead of sending")
+    args = ap.parse_args()
+
+    with open(args.recipients, encoding="utf-8") as f:
+        recipients = f.read().splitlines()
+    kw = dict(snapshot_file=args.snapshot, dry_run=args.dry_run,
+              edge_threshold=args.threshold, price_move=args.price_move)
+
+    if args.watch:
+        watch(recipients, export_file=args.export, **kw)
+    elif run_once(recipients, export_file=args.export, **kw) is None:
+        print("No new export since the last digest.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+# ----------------------------------------------------
+# ROUND SNAPSHOT – one loader publishes the round, every replica maps it
+#
+#   python round_snapshot.py --out /srv/round --watch     # the loader
+#   AFL_SNAPSHOT_DIR=/srv/round streamlit run afl_dashboard_app.py
+#   AFL_SNAPSHOT_DIR=/srv/round gunicorn api:app
+#
+# The loader parses Export_simple.xlsx + upcoming_round_summary.xlsx once
+# and writes a versioned directory:
+#   <version>/codes.npy     int16   market table category codes (int32 past 32767)
+#   <version>/values.npy    float32 market table odds/edges
+#   <version>/values64.npy  float64 same columns at full precision (API, diffs)
+#   <version>/extras.pkl    fixtures, category labels, last-5 stats (a few KB)
+#   <version>/validation.json  export_validator report the version passed
+#   CURRENT                 name of the live version – replaced atomically
+# Replicas np.load(mmap_mode="r") the arrays, so the pages are shared through
+# the OS page cache and startup is a few small reads. round_data serves
+# load_round / load_market_table / load_stats / data_version from here
+# whenever AFL_SNAPSHOT_DIR is set, and picks up a new CURRENT on the next call.
+# A round that fails validation is never published – CURRENT stays on the
+# last good version.
+# ----------------------------------------------------
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import round_data
+from export_validator import InvalidExport, validate
+from market_table import MarketTable
+
+# ————— CONFIG —————
+SNAPSHOT_DIR = os.environ.get("AFL_SNAPSHOT_DIR", "round_snapshot")
+KEEP         = 3            # published versions kept for readers still mapping them
+POLL_SECONDS = 10
+# ——————————————————
+
+
+class Snapshot:
+    """A published round, mapped read-only. Build-once views are cached on the object."""
+    def __init__(self, path):
+        self.path = path
+        self.version = os.path.basename(path)
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        with open(os.path.join(path, "extras.pkl"), "rb") as f:
+            extras = pickle.load(f)
+        self.fixtures = extras["fixtures"]
+        self.overall, self.venue = extras["overall"], extras["venue"]
+
+        codes = np.load(os.path.join(path, "codes.npy"), mmap_mode="r")
+        values = np.load(os.path.join(path, "values.npy"), mmap_mode="r")
+        self.values64 = np.load(os.path.join(path, "values64.npy"), mmap_mode="r")
+        self.table = MarketTable(codes, extras["categories"], values,
+                                 self.meta["num_cols"], extras["offsets"])
+        self._markets = None
+        self._lock = threading.Lock()
+
+    def source_version(self, path):
+        """(mtime_ns, size) the workbook had when published, or None if not in the snapshot."""
+        v = self.meta["sources"].get(os.path.basename(path))
+        return tuple(v) if v else None
+
+    @property
+    def markets(self):
+        """The round_data.load_round markets frame (float64), rebuilt from the mapped arrays."""
+        with self._lock:
+            if self._markets is None:
+                t, dtypes = self.table, self.meta["dtypes"]
+                data = {c: pd.Series(t.cat(c)).astype(dtypes[c]) for c in t.cat_cols}
+                data.update({c: self.values64[i] for i, c in enumerate(t.num_cols)})
+                self._markets = pd.DataFrame(data)[self.meta["columns"]]
+            return self._markets
+
+
+# ————— Reader —————
+_current = {}            # root -> (CURRENT stat, Snapshot)
+_current_lock = threading.Lock()
+
+
+def current(root=SNAPSHOT_DIR, retries=3):
+    """The live snapshot under root (None if nothing is published yet)."""
+    pointer = os.path.join(root, "CURRENT")
+    for attempt in range(retries + 1):
+        try:
+            st = os.stat(pointer)
+        except FileNotFoundError:
+            return None
+        key = (st.st_ino, st.st_mtime_ns)
+        hit = _current.get(root)
+        if hit and hit[0] == key:
+            return hit[1]
+        with _current_lock:
+            hit = _current.get(root)
+            if hit and hit[0] == key:
+                return hit[1]
+            try:
+                with open(pointer, encoding="utf-8") as f:
+                    name = f.read().strip()
+                snap = Snapshot(os.path.join(root, name))
+            except FileNotFoundError:
+                # the version we read was pruned by newer publishes before we
+                # got to it – CURRENT has moved on, read it again
+                if attempt == retries:
+                    raise
+                continue
+            _current[root] = (key, snap)
+            return snap
+
+
+# ————— Loader —————
+class SourceChanged(RuntimeError):
+    pass
+
+
+def source_versions(export_file, summary_file):
+    return {os.path.basename(p): list(round_data.workbook_version(p))
+            for p in (export_file, summary_file)}
+
+
+def publish(root=SNAPSHOT_DIR, export_file=None, summary_file=None):
+    """
+    Validate and parse both workbooks and publish them as a new version.
+    Returns its name (None if unchanged); raises InvalidExport if the round has errors.
+    """
+    export_file = export_file or round_data.EXPORT_FILE
+    summary_file = summary_file or round_data.SUMMARY_FILE
+    sources = source_versions(export_file, summary_file)
+    digest = hashlib.sha1(json.dumps(sources, sort_keys=True).encode()).hexdigest()[:10]
+
+    live = current(root)
+    if live is not None and live.meta["digest"] == digest:
+        return None
+
+    report = validate(export_file, summary_file)
+    if not report["ok"]:
+        raise InvalidExport(report)
+
+    # always the workbooks themselves, even in a process serving a snapshot
+    fixtures, markets = round_data.load_round(export_file, snapshot=False)
+    overall, venue = round_data.load_stats(summary_file, snapshot=False)
+    table = round_data.load_market_table(export_file, snapshot=False)
+    # a workbook re-exported while we read it: what we have may be neither
+    # version – don't publish it under either name
+    if source_versions(export_file, summary_file) != sources:
+        raise SourceChanged("a workbook changed while it was being read – retry once it's stable")
+    # full-precision copy of the numeric columns, in the table's (grouped by game) row order
+    order = np.argsort(pd.factorize(markets["Game"], sort=False)[0], kind="stable")
+    values64 = np.ascontiguousarray(
+        markets[table.num_cols].to_numpy(dtype=np.float64).T[:, order].reshape(len(table.num_cols), -1))
+
+    name = f"v{time.strftime('%Y%m%d-%H%M%S')}-{digest}"
+    os.makedirs(root, exist_ok=True)
+    tmp = os.path.join(root, f".{name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    np.save(os.path.join(tmp, "codes.npy"), table.codes)
+    np.save(os.path.join(tmp, "values.npy"), table.values)
+    np.save(os.path.join(tmp, "values64.npy"), values64)
+    with open(os.path.join(tmp, "extras.pkl"), "wb") as f:
+        pickle.dump({"fixtures": fixtures, "overall": overall, "venue": venue,
+                     "categories": table.categories, "offsets": table._offsets},
+                    f, protocol=pickle.HIGHEST_PROTOCOL)
+    with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "digest": digest,
+            "sources": sources,
+            "published": time.time(),
+            "columns": list(markets.columns),
+            "dtypes": {c: str(markets[c].dtype) for c in markets.columns},
+            "num_cols": table.num_cols,
+            "rows": len(table),
+        }, f, indent=1)
+    with open(os.path.join(tmp, "validation.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1, default=str)
+    for fn in os.listdir(tmp):
+        with open(os.path.join(tmp, fn), "rb") as f:
+            os.fsync(f.fileno())
+
+    # the version directory first, then the pointer – readers only ever
+    # see a complete version
+    os.rename(tmp, os.path.join(root, name))
+    pointer = os.path.join(root, "CURRENT")
+    with open(pointer + ".tmp", "w", encoding="utf-8") as f:
+        f.write(name + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(pointer + ".tmp", pointer)
+
+    # old versions go once they're out of the window; processes still mapping
+    # one keep their pages until they move on (unlinked files stay readable)
+    versions = sorted(d for d in os.listdir(root) if d.startswith("v"))
+    for old in versions[:-KEEP]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+    return name
+
+
+def watch(root=SNAPSHOT_DIR, export_file=None, summary_file=None, poll=POLL_SECONDS):
+    """Publish whenever either workbook changes (and has stopped changing)."""
+    last = rejected = None
+    while True:
+        try:
+            sources = source_versions(export_file or round_data.EXPORT_FILE,
+                                      summary_file or round_data.SUMMARY_FILE)
+        except FileNotFoundError:
+            sources = None
+        # a rejected round is only looked at again once a workbook changes
+        if sources is not None and sources == last and sources != rejected:
+            try:
+                name = publish(root, export_file, summary_file)
+                if name:
+                    print(f"✅ Published {name}")
+            except InvalidExport as e:
+                rejected = sources
+                print(f"❌ Not published: {e}")
+            except Exception as e:
+                # a half-written export – keep serving the last good version
+                print(f"⚠️ Publish failed: {e}")
+        last = sources
+        time.sleep(poll)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Publish the round as a memory-mapped snapshot.")
+    ap.add_argument("--out", default=SNAPSHOT_DIR, help="snapshot root (AFL_SNAPSHOT_DIR for readers)")
+    ap.add_argument("--export", default=None)
+    ap.add_argument("--summary", default=None)
+    ap.add_argument("--watch", action="store_true", help=f"keep polling every {POLL_SECONDS}s")
+    args = ap.parse_args()
+
+    if args.watch:
+        watch(args.out, args.export, args.summary)
+    else:
+        try:
+            name = publish(args.out, args.export, args.summary)
+        except (InvalidExport, SourceChanged) as e:
+            raise SystemExit(f"❌ Not published: {e}")
+        print(f"✅ Published {name}" if name else "Snapshot is already up to date.")
+
+
+if __name__ == "__main__":
+    main()
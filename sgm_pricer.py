@@ -0,0 +1,224 @@
+# ----------------------------------------------------
+# SAME GAME MULTI PRICER
+# Prices multi-leg bets built from the per-player goalscorer & disposal
+# markets. Each leg's probability comes from the model's FairOdds; legs are
+# tied together with a Gaussian copula and the joint hit rate of every
+# candidate multi is read off one batch of Monte Carlo draws.
+# ----------------------------------------------------
+
+import itertools
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+# ————— CONFIG —————
+GOAL_MARKETS     = ["Anytime Goalscorer", "2+ Goalscorer", "3+ Goalscorer"]
+DISPOSAL_MARKETS = ["15+ Disposals", "20+ Disposals", "25+ Disposals", "30+ Disposals"]
+FAMILY = {**{m: "goals" for m in GOAL_MARKETS},
+          **{m: "disposals" for m in DISPOSAL_MARKETS}}
+
+# correlation between the latent "performance" of two (player, family) pairs
+RHO_SAME_PLAYER  = 0.35    # a player's goals vs his own disposals
+RHO_TEAMMATES    = 0.10    # teammates, same family (team on top lifts everyone)
+RHO_OPPONENTS    = -0.10   # opposing players, same family
+RHO_CROSS_FAMILY = 0.05    # teammates, goals vs disposals
+
+N_SIMS   = 20_000
+MAX_LEGS = 3
+CHUNK    = 4096            # combos priced per vectorised batch
+# ——————————————————
+
+
+# ————— Legs —————
+def legs_from_blocks(blocks):
+    """
+    Flatten {market label: (home_df, away_df)} – the parse_block output –
+    into one row per leg with its model probability and bookie price.
+    """
+    frames = []
+    for market, (hdf, adf) in blocks.items():
+        if market not in FAMILY:
+            continue
+        for side, df in (("home", hdf), ("away", adf)):
+            if df is None or df.empty:
+                continue
+            frames.append(pd.DataFrame({
+                "Market": market,
+                "Family": FAMILY[market],
+                "Side":   side,
+                "Team":   df["Team"].astype(str).str.strip().values,
+                "Player": df["Player"].astype(str).str.strip().values,
+                "FairOdds": pd.to_numeric(df["FairOdds"], errors="coerce").values,
+                "Odds":     pd.to_numeric(df["BookieOdds"], errors="coerce").values,
+            }))
+    if not frames:
+        return pd.DataFrame(columns=["Market", "Family", "Side", "Team", "Player",
+                                     "FairOdds", "Odds", "Prob", "Leg"])
+
+    legs = pd.concat(frames, ignore_index=True)
+    legs = legs.dropna(subset=["FairOdds", "Odds"])
+    legs = legs[(legs["FairOdds"] > 0) & (legs["Odds"] > 1)]
+    # a FairOdds of 1.00 would be a certainty, which the copula can't represent
+    legs["Prob"] = (1 / legs["FairOdds"]).clip(1e-4, 0.9999)
+    # a player is (team, name) – two namesakes on opposite sides are two
+    # players, and their legs name the team to tell them apart
+    legs = legs.drop_duplicates(["Team", "Player", "Market"])
+    namesake = legs.groupby("Player")["Team"].transform("nunique") > 1
+    who = legs["Player"].where(~namesake, legs["Player"] + " (" + legs["Team"] + ")")
+    legs["Leg"] = who + " " + legs["Market"]
+    return legs.reset_index(drop=True)
+
+
+def latent_key(df):
+    """One latent per (team, player, family)."""
+    return df["Team"] + "|" + df["Player"] + "|" + df["Family"]
+
+
+# ————— Correlation model —————
+def latent_correlation(latents, *, rho_same_player=RHO_SAME_PLAYER,
+                       rho_teammates=RHO_TEAMMATES, rho_opponents=RHO_OPPONENTS,
+                       rho_cross_family=RHO_CROSS_FAMILY):
+    """
+    Correlation matrix between latent (Team, Player, Family) variables.
+    Nested lines of one player (AGS / 2+ / 3+) share a single latent, so
+    they are perfectly consistent with each other.
+    """
+    player = (latents["Team"] + "|" + latents["Player"]).to_numpy()
+    side   = latents["Side"].to_numpy()
+    fam    = latents["Family"].to_numpy()
+
+    same_player = player[:, None] == player[None, :]
+    same_team   = side[:, None] == side[None, :]
+    same_fam    = fam[:, None] == fam[None, :]
+
+    C = np.zeros((len(latents), len(latents)))
+    C[same_team & same_fam]    = rho_teammates
+    C[~same_team & same_fam]   = rho_opponents
+    C[same_team & ~same_fam]   = rho_cross_family
+    C[same_player & ~same_fam] = rho_same_player
+    np.fill_diagonal(C, 1.0)
+    return nearest_psd(C)
+
+
+def nearest_psd(C, eps=1e-8):
+    # clip negative eigenvalues and rescale back to a unit diagonal
+    w, v = np.linalg.eigh(C)
+    if w.min() >= eps:
+        return C
+    C = (v * np.maximum(w, eps)) @ v.T
+    d = np.sqrt(np.diag(C))
+    return C / np.outer(d, d)
+
+
+# ————— Simulation —————
+def simulate_hits(legs, n_sims=N_SIMS, seed=None, **rho):
+    """
+    Draw the latent variables once and return, per leg, a packed bitmask of
+    the simulations in which that leg lands: uint64 array (n_legs, n_words).
+    """
+    latents = legs[["Team", "Player", "Side", "Family"]].drop_duplicates(
+        ["Team", "Player", "Family"]).reset_index(drop=True)
+    latent_of = pd.Index(latent_key(latents)).get_indexer(latent_key(legs))
+
+    L = np.linalg.cholesky(latent_correlation(latents, **rho))
+    rng = np.random.default_rng(seed)
+    Z = rng.standard_normal((n_sims, len(latents)), dtype=np.float32) @ L.T.astype(np.float32)
+
+    # a leg with probability p lands when its latent clears the (1-p) quantile
+    nd = NormalDist()
+    thresholds = np.array([nd.inv_cdf(1 - p) for p in legs["Prob"]], dtype=np.float32)
+    hits = Z[:, latent_of] > thresholds              # (n_sims, n_legs) bool
+
+    packed = np.packbits(hits.T, axis=1)             # (n_legs, n_sims/8)
+    pad = (-packed.shape[1]) % 8
+    if pad:
+        packed = np.pad(packed, ((0, 0), (0, pad)))
+    return packed.view(np.uint64)
+
+
+if hasattr(np, "bitwise_count"):
+    def _popcount(words):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+else:
+    _POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(words):
+        return _POPCOUNT[words.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+def joint_probs(packed, combos, n_sims):
+    """Joint hit rate for each row of `combos` (int array, n_combos × k)."""
+    out = np.empty(len(combos))
+    for i in range(0, len(combos), CHUNK):
+        block = packed[combos[i:i + CHUNK]]          # (chunk, k, n_words)
+        out[i:i + CHUNK] = _popcount(np.bitwise_and.reduce(block, axis=1))
+    return out / n_sims
+
+
+def candidate_combos(legs, k):
+    """Every k-leg combination that doesn't reuse a player's latent."""
+    combos = np.array(list(itertools.combinations(range(len(legs)), k)), dtype=np.int64)
+    if combos.size == 0:
+        return combos.reshape(0, k)
+    key = pd.factorize(latent_key(legs))[0][combos]
+    key.sort(axis=1)
+    distinct = (np.diff(key, axis=1) != 0).all(axis=1)
+    return combos[distinct]
+
+
+# ————— Pricing —————
+def price_multis(legs, *, max_legs=MAX_LEGS, min_legs=2, n_sims=N_SIMS,
+                 offered=None, seed=None, **rho):
+    """
+    Price every candidate multi of `min_legs`..`max_legs` legs.
+
+    `offered` sets the multi odds the edge is measured against:
+      None      – the straight product of the leg bookie odds
+      dict      – {tuple of leg labels: odds}; unlisted combos are dropped
+      callable  – f(list of leg labels, product odds) -> odds
+    """
+    cols = ["Legs", "N", "Prob", "FairOdds", "Offered", "Edge %"]
+    if len(legs) < min_legs:
+        return pd.DataFrame(columns=cols)
+
+    packed = simulate_hits(legs, n_sims=n_sims, seed=seed, **rho)
+    labels = legs["Leg"].to_numpy()
+    log_odds = np.log(legs["Odds"].to_numpy(dtype=float))
+
+    frames = []
+    for k in range(min_legs, max_legs + 1):
+        combos = candidate_combos(legs, k)
+        if not len(combos):
+            continue
+        prob = joint_probs(packed, combos, n_sims)
+        product = np.exp(log_odds[combos].sum(axis=1))
+        names = [tuple(labels[c]) for c in combos]
+
+        if offered is None:
+            price = product
+        elif callable(offered):
+            price = np.array([offered(list(n), p) for n, p in zip(names, product)], dtype=float)
+        else:
+            price = np.array([offered.get(n, np.nan) for n in names], dtype=float)
+
+        frames.append(pd.DataFrame({
+            "Legs": [" + ".join(n) for n in names],
+            "N": k,
+            "Prob": prob,
+            "Offered": price,
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=cols)
+    out = pd.concat(frames, ignore_index=True).dropna(subset=["Offered"])
+    with np.errstate(divide="ignore"):
+        out["FairOdds"] = 1 / out["Prob"]
+    out["Edge %"] = (out["Prob"] * out["Offered"] - 1) * 100
+    return out[cols]
+
+
+def rank_multis(priced, *, min_edge=0.0, min_prob=0.0, top=50):
+    """Best multis by edge against the offered price."""
+    keep = priced[(priced["Edge %"] >= min_edge) & (priced["Prob"] >= min_prob)]
+    return keep.sort_values("Edge %", ascending=False).head(top).reset_index(drop=True)
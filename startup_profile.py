@@ -0,0 +1,159 @@
+# ----------------------------------------------------
+# STARTUP PROFILE – cold-start timings per entry point
+#
+# Off unless AFL_PROFILE_STARTUP=1. Each entry point calls
+#
+#   startup_profile.start("afl_dashboard_app")   # before its imports
+#   startup_profile.mark("imports")              # after them
+#   startup_profile.finish()                     # once the first page is out
+#
+# and the first run in a process appends one JSON line to PROFILE_FILE:
+# ms per stage, total ms to first render, and which top-level packages each
+# stage pulled in (so a stray eager import shows up by name).
+# Under `streamlit run` the server has imported streamlit before the script
+# starts, so in-app records leave it out; the cold runner below starts the
+# clock before `import streamlit` and records it as its own stage.
+#
+#   python startup_profile.py                    # every entry, fresh interpreters
+#   python startup_profile.py tools.py --budget-ms 800
+# ----------------------------------------------------
+
+import json
+import os
+import sys
+import time
+
+# ————— CONFIG —————
+ENABLED      = os.environ.get("AFL_PROFILE_STARTUP") == "1"
+PROFILE_FILE = os.environ.get("AFL_PROFILE_FILE", "startup_profile.jsonl")
+ENTRY_POINTS = {
+    # entry: how to bring it up cold
+    "afl_dashboard_app.py": "streamlit",
+    "tools.py":             "streamlit",
+    "testing.py":           "streamlit",
+    "localtesting.py":      "streamlit",
+    "api":                  "module",
+    "static_export":        "module",
+    "round_notifier":       "module",
+    "bulk_sender":          "module",
+}
+# ——————————————————
+
+_runs = {}        # entry -> in-flight record
+_done = set()     # entries already recorded by this process (streamlit reruns)
+
+
+def _packages():
+    return {m.partition(".")[0] for m in sys.modules}
+
+
+def start(entry):
+    if not ENABLED or entry in _done or entry in _runs:
+        return
+    now = time.perf_counter()
+    _runs[entry] = {"t0": now, "last": now, "pkgs": _packages(),
+                    "stages": {}, "loaded": {}}
+
+
+def mark(stage, entry=None):
+    """Close a stage: time since the previous mark and the packages it loaded."""
+    run = _current(entry)
+    if run is None:
+        return
+    now, pkgs = time.perf_counter(), _packages()
+    run["stages"][stage] = round((now - run["last"]) * 1000, 1)
+    run["loaded"][stage] = sorted(pkgs - run["pkgs"])
+    run["last"], run["pkgs"] = now, pkgs
+
+
+def finish(entry=None):
+    """First render is out – write the record (once per entry per process)."""
+    run = _current(entry)
+    if run is None:
+        return
+    entry = entry or next(iter(_runs))
+    mark("render", entry)
+    _runs.pop(entry)
+    _done.add(entry)
+
+    rec = {
+        "entry": entry,
+        "ts": time.time(),
+        "python": sys.version.split()[0],
+        "pid": os.getpid(),
+        "stages_ms": run["stages"],
+        "first_render_ms": round((run["last"] - run["t0"]) * 1000, 1),
+        "loaded": {k: v for k, v in run["loaded"].items() if v},
+    }
+    with open(PROFILE_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps(rec) + "\n")
+    return rec
+
+
+def _current(entry):
+    if not ENABLED or not _runs:
+        return None
+    return _runs.get(entry) if entry else _runs[next(iter(_runs))]
+
+
+# ————— Cold-start runner —————
+_STREAMLIT = """
+import os, sys, startup_profile
+# the clock starts before streamlit is imported – the script's own start()
+# then joins this run instead of starting a new one
+entry = os.path.splitext(os.path.basename(sys.argv[1]))[0]
+startup_profile.start(entry)
+from streamlit.testing.v1 import AppTest
+startup_profile.mark("streamlit", entry)
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.run()
+if at.exception:
+    sys.exit(at.exception[0].value)
+"""
+
+_MODULE = """
+import sys, startup_profile
+startup_profile.start(sys.argv[1])
+__import__(sys.argv[1])
+startup_profile.mark("imports", sys.argv[1])
+startup_profile.finish(sys.argv[1])
+"""
+
+
+def profile_cold(entry, kind, profile_file):
+    """Bring one entry point up in a fresh interpreter and return its record."""
+    import subprocess
+
+    env = dict(os.environ, AFL_PROFILE_STARTUP="1", AFL_PROFILE_FILE=profile_file)
+    code = _STREAMLIT if kind == "streamlit" else _MODULE
+    target = os.path.abspath(entry) if kind == "streamlit" else entry
+    subprocess.run([sys.executable, "-c", code, target], env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+    with open(profile_file, encoding="utf-8") as f:
+        return json.loads(f.read().splitlines()[-1])
+
+
+def main():
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Measure cold start of each entry point.")
+    ap.add_argument("entries", nargs="*", help=f"default: {', '.join(ENTRY_POINTS)}")
+    ap.add_argument("--budget-ms", type=float, help="fail if any first render is slower")
+    ap.add_argument("--out", default=PROFILE_FILE, help="JSONL file the records are appended to")
+    args = ap.parse_args()
+
+    over = []
+    for entry in args.entries or list(ENTRY_POINTS):
+        kind = ENTRY_POINTS.get(entry, "streamlit" if entry.endswith(".py") else "module")
+        rec = profile_cold(entry, kind, args.out)
+        stages = "  ".join(f"{k} {v:.0f}ms" for k, v in rec["stages_ms"].items())
+        print(f"{entry:<22} {rec['first_render_ms']:>7.0f}ms   {stages}")
+        if args.budget_ms and rec["first_render_ms"] > args.budget_ms:
+            over.append(entry)
+
+    if over:
+        sys.exit(f"❌ Over the {args.budget_ms:.0f}ms budget: {', '.join(over)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+# ----------------------------------------------------
+# STATIC EXPORT – pre-render every game page for a CDN / plain web server
+#
+#   python static_export.py --out site --workers 4
+#
+# site/index.html                         fixtures
+# site/leaderboard.html                   best edges of the round
+# site/games/<slug>/{goalscorer,disposals,teams}.html
+# site/api/...json                        same payloads as api.py
+#
+# `site` is a symlink into site.versions/<version>/ – each build goes into
+# its own directory and the link is swapped atomically, so a web server
+# always serves one complete build.
+# ----------------------------------------------------
+
+import argparse
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+
+import round_data
+from api import build_payloads, slugify, _default
+from rendering import make_table_html, style_table, prep
+
+PAGE_CSS = """
+body { background-color: #FFF8F0; font-family: "Source Sans Pro", sans-serif; margin: 2rem; }
+th, td { text-align: center !important; vertical-align: middle !important; }
+table { border-collapse: collapse; width: 100%; }
+nav a { margin-right: 1rem; }
+.cols { display: flex; gap: 2%; }
+.cols > div { flex: 1; }
+.caption { color: #666; font-size: 14px; font-style: italic; }
+"""
+
+VIEWS = ["goalscorer", "disposals", "teams"]
+LEADERBOARD_ROWS = 100
+KEEP = 2                # built sites kept in <out>.versions/ (the live one and the one before)
+
+
+def page(title, body, nav=""):
+    return (
+        "<!doctype html><html><head><meta charset='utf-8'>"
+        f"<title>{escape(title)} | THE MODEL</title>"
+        f"<style>{PAGE_CSS}</style></head><body>"
+        f"{nav}{body}</body></html>"
+    )
+
+
+def styled_html(styler, uid):
+    # fixed table ids keep the output byte-identical between builds (stable ETags)
+    return styler.set_uuid(slugify(uid)).hide(axis="index").to_html()
+
+
+def two_cols(left_cap, left_html, right_cap, right_html):
+    return (
+        "<div class='cols'>"
+        f"<div><p class='caption'>{escape(left_cap)}</p>{left_html}</div>"
+        f"<div><p class='caption'>{escape(right_cap)}</p>{right_html}</div>"
+        "</div>"
+    )
+
+
+# ————— Views —————
+def markets_view(info, g, markets):
+    html = ""
+    for label in markets:
+        html += f"<h3>{escape(label)}</h3>"
+        sides = []
+        for side in ("home", "away"):
+            df = g[(g["Market"] == label) & (g["Side"] == side)]
+            sides.append(styled_html(prep(df), f"{label}-{side}") if not df.empty
+                         else "<p>No data.</p>")
+        html += two_cols(info["home"], sides[0], info["away"], sides[1])
+    return html
+
+
+def teams_view(info, overall, venue):
+    headers = ["Date", "Game", "Result", "Line", "O/U"]
+    home, away = info["home"], info["away"]
+
+    html = "<h3>Last 5</h3>" + two_cols(
+        home, make_table_html(overall[overall["Team"] == home], add_divider=True,
+                              date_fmt="%d %b", headers=headers),
+        away, make_table_html(overall[overall["Team"] == away], add_divider=False,
+                              date_fmt="%d %b", headers=headers),
+    )
+
+    hv = venue[venue["Team"] == home]
+    stadium = hv["Venue"].iloc[0] if not hv.empty else info["city"]
+    html += f"<h3>Last 5 at {escape(str(stadium))}</h3>" + two_cols(
+        home, make_table_html(hv, add_divider=True, date_fmt="%d/%m/%Y", headers=headers),
+        away, make_table_html(venue[venue["Team"] == away], add_divider=False,
+                              date_fmt="%d/%m/%Y", headers=headers),
+    )
+    return html
+
+
+def render_game(job):
+    """Worker: write one game's three views. Runs in a child process."""
+    out, gm, info, g, overall, venue = job
+    slug = slugify(gm)
+    game_dir = os.path.join(out, "games", slug)
+    os.makedirs(game_dir, exist_ok=True)
+
+    nav = ("<nav><a href='../../index.html'>All games</a>"
+           "<a href='../../leaderboard.html'>Best of Round</a>"
+           + "".join(f"<a href='{v}.html'>{v.title()}</a>" for v in VIEWS)
+           + "</nav>")
+    when = f"{info['date']:%B %d}" if info.get("date") else ""
+    heading = (f"<h2>Round {info['round']}: {escape(info['home'])} VS {escape(info['away'])}</h2>"
+               f"<p>{' · '.join(filter(None, [when, escape(info['city'])]))}</p><hr>")
+
+    bodies = {
+        "goalscorer": markets_view(info, g, round_data.GOAL_MARKETS),
+        "disposals":  markets_view(info, g, round_data.DISPOSAL_MARKETS),
+        "teams":      teams_view(info, overall, venue),
+    }
+    for view, body in bodies.items():
+        with open(os.path.join(game_dir, f"{view}.html"), "w", encoding="utf-8") as f:
+            f.write(page(f"{gm} – {view.title()}", heading + body, nav))
+    return slug
+
+
+# ————— Round-level pages —————
+def write_round_pages(out, fixtures, markets, overall, venue):
+    links = "".join(
+        f"<li><a href='games/{slugify(gm)}/goalscorer.html'>{escape(gm)}</a> – "
+        + " · ".join(filter(None, [f"{info['date']:%a %d %b}" if info.get("date") else "",
+                                   escape(info["city"])]))
+        + "</li>"
+        for gm, info in fixtures.items()
+    )
+    with open(os.path.join(out, "index.html"), "w", encoding="utf-8") as f:
+        f.write(page(f"Round {round_data.ROUND}",
+                     f"<h1>Round {round_data.ROUND}</h1>"
+                     "<p><a href='leaderboard.html'>Best of Round</a></p>"
+                     f"<ul>{links}</ul>"))
+
+    best = round_data.filter_markets(markets, top=LEADERBOARD_ROWS)
+    table = styled_html(style_table(
+        best[["Game", "Market", "Team", "Player", "Odds", "Edge %", "Adj Edge %"]],
+        odds_col="Odds"), "leaderboard")
+    with open(os.path.join(out, "leaderboard.html"), "w", encoding="utf-8") as f:
+        f.write(page("Best of Round",
+                     "<nav><a href='index.html'>All games</a></nav>"
+                     f"<h1>Best of Round {round_data.ROUND}</h1>{table}"))
+
+    # JSON fragments – identical to what api.py serves
+    for path, payload in build_payloads(fixtures, markets, overall, venue).items():
+        fn = os.path.join(out, "api", path.lstrip("/") + ".json")
+        os.makedirs(os.path.dirname(fn), exist_ok=True)
+        with open(fn, "w", encoding="utf-8") as f:
+            json.dump(payload, f, default=_default, separators=(",", ":"))
+
+
+def publish(tmp, out):
+    """
+    Move the freshly built tree into <out>.versions/ and repoint the `out`
+    symlink at it with os.replace – readers see the old site or the new one,
+    never half a site or no site at all.
+    """
+    versions = f"{out}.versions"
+    os.makedirs(versions, exist_ok=True)
+    target = os.path.join(versions, f"v{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+    os.rename(tmp, target)
+
+    if os.path.isdir(out) and not os.path.islink(out):
+        # a site built before versioned publishing – moved in with the rest (once)
+        os.rename(out, os.path.join(versions, "v0-legacy"))
+    link = f"{out}.link.tmp"
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(os.path.relpath(target, os.path.dirname(os.path.abspath(out))), link)
+    os.replace(link, out)
+
+    # a request already inside the previous build can still finish it
+    for old in sorted(os.listdir(versions))[:-KEEP]:
+        shutil.rmtree(os.path.join(versions, old), ignore_errors=True)
+
+
+def build(out="site", workers=None, export_file=round_data.EXPORT_FILE,
+          summary_file=round_data.SUMMARY_FILE):
+    fixtures, markets = round_data.load_round(export_file)
+    overall, venue = round_data.load_stats(summary_file)
+
+    tmp = f"{out}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    jobs = []
+    for gm, info in fixtures.items():
+        teams = [info["home"], info["away"]]
+        jobs.append((tmp, gm, info, markets[markets["Game"] == gm],
+                     overall[overall["Team"].isin(teams)], venue[venue["Team"].isin(teams)]))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        games = list(pool.map(render_game, jobs))
+    write_round_pages(tmp, fixtures, markets, overall, venue)
+
+    publish(tmp, out)
+    return games
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Pre-render every game page to static HTML/JSON.")
+    ap.add_argument("--out", default="site")
+    ap.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    ap.add_argument("--export", default=round_data.EXPORT_FILE)
+    ap.add_argument("--summary", default=round_data.SUMMARY_FILE)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    games = build(args.out, args.workers, args.export, args.summary)
+    print(f"✅ Rendered {len(games)} games to '{args.out}/' in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
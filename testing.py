@@ -1,38 +1,30 @@
 # team_stats_local.py
 
+import startup_profile
+startup_profile.start("testing")
+
 import streamlit as st
 import pandas as pd
-import os, io, base64
-from PIL import Image
+
+import round_data
+from rendering import load_logo_b64
+
+startup_profile.mark("imports")
 
 # ————— CONFIG —————
 EXPORT_FILE    = "Export.xlsx"
 SUMMARY_FILE   = "upcoming_round_summary.xlsx"
-SHEET_OVERALL  = "Overall_Last5"
-SHEET_VENUE    = "Venue_Last5"
 
 TICK, CROSS    = "✅", "❌"
 ARROW_UP       = "⬆️"
 ARROW_DN       = "⬇️"
 # ——————————————————
 
-@st.cache_data
 def load_fixtures():
-    xls = pd.ExcelFile(EXPORT_FILE)
-    fixtures = []
-    for sheet in xls.sheet_names:
-        df0 = pd.read_excel(xls, sheet, header=None)
-        if df0.shape[1] > 1:
-            m = df0.iat[0, 1]
-            if isinstance(m, str) and "VS" in m:
-                fixtures.append(m.strip())
-    return fixtures
-
-@st.cache_data
+    return list(round_data.load_fixtures(EXPORT_FILE))
+
 def load_stats():
-    overall = pd.read_excel(SUMMARY_FILE, sheet_name=SHEET_OVERALL)
-    venue   = pd.read_excel(SUMMARY_FILE, sheet_name=SHEET_VENUE)
-    return overall, venue
+    return round_data.load_stats(SUMMARY_FILE)
 
 def res_icon(r):
     return TICK if str(r).upper().startswith("W") else CROSS
@@ -44,23 +36,10 @@ def ou_icon(r):
     r = str(r).lower()
     return ARROW_UP if r.startswith("o") else ARROW_DN
 
-def img_to_b64(img):
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    return base64.b64encode(buf.getvalue()).decode()
-
-def load_logo_b64(team):
-    for ext in (".png", ".jpg", ".jpeg"):
-        fn = f"{team}{ext}"
-        if os.path.exists(fn):
-            img = Image.open(fn).resize((30, 30))
-            return img_to_b64(img)
-    return None
-
 def make_table_html(df, add_right_border=False):
     rows = []
     for _, r in df.iterrows():
-        date = pd.to_datetime(r["GameDate"]).strftime("%d %b")
+        date = pd.to_datetime(r["GameDate"]).strftime("%d %b") if pd.notna(r["GameDate"]) else ""
         b64  = load_logo_b64(r["Opponent"])
         if b64:
             logo_td = (
@@ -126,3 +105,4 @@ def main():
 
 if __name__ == "__main__":
     main()
+    startup_profile.finish()
@@ -0,0 +1,20 @@
+import glob
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def round_dir(tmp_path, monkeypatch):
+    """A copy of the round's workbooks and team logos to work in (and break)."""
+    for fn in glob.glob(os.path.join(ROOT, "*.xlsx")) + glob.glob(os.path.join(ROOT, "*.png")):
+        shutil.copy(fn, tmp_path)
+    monkeypatch.chdir(tmp_path)
+    import round_data
+    monkeypatch.setattr(round_data, "CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path
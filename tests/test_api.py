@@ -0,0 +1,77 @@
+import gzip
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import api
+import round_data
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(round_data, "CACHE_DIR", "")     # no pickles next to the tests
+    return api.RoundAPI(os.path.join(ROOT, round_data.EXPORT_FILE),
+                        os.path.join(ROOT, round_data.SUMMARY_FILE))
+
+
+def get(app, path, **headers):
+    environ = {"REQUEST_METHOD": "GET", "PATH_INFO": path}
+    environ.update({f"HTTP_{k.upper()}": v for k, v in headers.items()})
+    out = {}
+
+    def start_response(status, hdrs):
+        out["status"], out["headers"] = status, dict(hdrs)
+    out["body"] = b"".join(app(environ, start_response))
+    return out
+
+
+def test_gzip_and_identity_have_their_own_etags(app):
+    plain = get(app, "/edges/top")
+    zipped = get(app, "/edges/top", accept_encoding="gzip")
+    assert plain["status"] == zipped["status"] == "200 OK"
+    assert zipped["headers"]["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(zipped["body"])) == json.loads(plain["body"])
+    assert plain["headers"]["ETag"] != zipped["headers"]["ETag"]
+
+
+def test_304_only_for_the_negotiated_representation(app):
+    plain = get(app, "/edges/top")["headers"]["ETag"]
+    zipped = get(app, "/edges/top", accept_encoding="gzip")["headers"]["ETag"]
+
+    assert get(app, "/edges/top", if_none_match=plain)["status"] == "304 Not Modified"
+    assert get(app, "/edges/top", if_none_match=f"W/{zipped}",
+               accept_encoding="gzip")["status"] == "304 Not Modified"
+    # holding the identity body but now negotiating gzip: send the gzip body
+    resp = get(app, "/edges/top", if_none_match=plain, accept_encoding="gzip")
+    assert resp["status"] == "200 OK"
+    assert resp["headers"]["ETag"] == zipped
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", True),
+    ("deflate, gzip;q=0.5", True),
+    ("gzip;q=0", False),
+    ("x-gzip", True),
+    ("*", True),
+    ("*;q=0", False),
+    ("identity", False),
+    ("", False),
+])
+def test_accepts_gzip(header, expected):
+    assert api.accepts_gzip(header) is expected
+
+
+def test_bad_first_load_is_a_503_and_logged(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(round_data, "CACHE_DIR", "")
+    bad = tmp_path / "Export_simple.xlsx"
+    bad.write_bytes(b"not a workbook")
+    app = api.RoundAPI(str(bad), os.path.join(ROOT, round_data.SUMMARY_FILE))
+    assert get(app, "/fixtures")["status"] == "503 Service Unavailable"
+    # the failure is cached for the version: still a 503, not a 404
+    assert get(app, "/fixtures")["status"] == "503 Service Unavailable"
+    assert len([r for r in caplog.records if r.name == "api"]) == 1
@@ -0,0 +1,115 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bulk_sender
+from bulk_sender import FakeTransport, send_bulk
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of sleeping (jitter pinned to 0)."""
+    out = []
+    # FakeTransport's zero latency sleeps too – only real waits count
+    monkeypatch.setattr(bulk_sender.time, "sleep", lambda s: s and out.append(s))
+    monkeypatch.setattr(bulk_sender.random, "random", lambda: 0.0)
+    return out
+
+
+def send(recipients, tmp_path, transport, **kw):
+    opts = dict(campaign="round-24", transport=transport, log_dir=str(tmp_path),
+                workers=1, rate=1e6, burst=1000, backoff=1.0)
+    opts.update(kw)
+    return send_bulk(recipients, "Round 24 is live", "hi", **opts)
+
+
+def log_lines(tmp_path, campaign="round-24"):
+    with open(tmp_path / f"{campaign}.jsonl", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_retries_with_exponential_backoff(tmp_path, sleeps):
+    fake = FakeTransport(fail={"b@x.com": 2})
+    result = send(["a@x.com", "b@x.com"], tmp_path, fake)
+
+    assert result == {"sent": 2, "skipped": 0, "failed": []}
+    assert sorted(r for r, _, _ in fake.sent) == ["a@x.com", "b@x.com"]
+    # two failed attempts -> waits of backoff * 1, backoff * 2
+    assert sleeps == [1.0, 2.0]
+
+
+def test_gives_up_after_max_retries(tmp_path, sleeps):
+    fake = FakeTransport(fail={"b@x.com": 10})
+    result = send(["a@x.com", "b@x.com"], tmp_path, fake, max_retries=3)
+
+    assert result["sent"] == 1
+    assert result["failed"] == ["b@x.com"]
+    assert sleeps == [1.0, 2.0, 4.0]
+    statuses = {rec["to"]: rec["status"] for rec in log_lines(tmp_path)}
+    assert statuses == {"a@x.com": "sent", "b@x.com": "failed"}
+
+
+def test_resume_skips_recipients_already_in_the_log(tmp_path, sleeps):
+    first = send(["a@x.com", "b@x.com", "c@x.com"], tmp_path,
+                 FakeTransport(fail={"c@x.com": 10}), max_retries=0)
+    assert first == {"sent": 2, "skipped": 0, "failed": ["c@x.com"]}
+
+    # re-running the campaign only sends to whoever didn't get it
+    fake = FakeTransport()
+    second = send(["a@x.com", "b@x.com", "c@x.com", "a@x.com"], tmp_path, fake)
+    assert second == {"sent": 1, "skipped": 2, "failed": []}
+    assert [r for r, _, _ in fake.sent] == ["c@x.com"]
+
+    third = send(["a@x.com", "b@x.com", "c@x.com"], tmp_path, FakeTransport())
+    assert third == {"sent": 0, "skipped": 3, "failed": []}
+
+
+def test_torn_last_line_is_ignored(tmp_path, sleeps):
+    send(["a@x.com"], tmp_path, FakeTransport())
+    with open(tmp_path / "round-24.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"to": "b@x.com", "sta')
+    result = send(["a@x.com", "b@x.com"], tmp_path, FakeTransport())
+    assert result == {"sent": 1, "skipped": 1, "failed": []}
+
+
+def test_fake_run_does_not_touch_the_real_log(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "body.txt").write_text("hi", encoding="utf-8")
+    (tmp_path / "to.txt").write_text("a@x.com\nb@x.com\n", encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", [
+        "bulk_sender.py", "--campaign", "round-24", "--subject", "s",
+        "--body-file", "body.txt", "--recipients", "to.txt", "--fake",
+    ])
+    bulk_sender.main()
+
+    assert not os.path.exists(os.path.join(bulk_sender.LOG_DIR, "round-24.jsonl"))
+    assert os.path.exists(os.path.join(bulk_sender.FAKE_LOG_DIR, "round-24.jsonl"))
+
+    # the real send on the same campaign still goes to everyone
+    fake = FakeTransport()
+    result = send_bulk(["a@x.com", "b@x.com"], "s", "hi", campaign="round-24",
+                       transport=fake, rate=1e6)
+    assert result == {"sent": 2, "skipped": 0, "failed": []}
+
+
+def test_unanswered_batch_slots_fail_without_retry(tmp_path, sleeps):
+    # a dropped batch connection: the first message was answered, the second
+    # may or may not have gone out
+    class DroppedBatch(bulk_sender.Transport):
+        def send_batch(self, messages):
+            return bulk_sender.unanswered(["id-1", None], "batch failed: reset")
+
+    result = send(["a@x.com", "b@x.com"], tmp_path, DroppedBatch())
+    assert result == {"sent": 1, "skipped": 0, "failed": ["b@x.com"]}
+    assert sleeps == []
+    statuses = {rec["to"]: rec["status"] for rec in log_lines(tmp_path)}
+    assert statuses == {"a@x.com": "sent", "b@x.com": "failed"}
+
+
+def test_transport_must_implement_send_batch():
+    with pytest.raises(TypeError):
+        bulk_sender.Transport()
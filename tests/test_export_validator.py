@@ -0,0 +1,68 @@
+import os
+
+import pytest
+from openpyxl import load_workbook
+
+import export_validator
+import round_data
+from export_validator import InvalidExport
+
+
+def set_cell(path, sheet, match, value, below=1):
+    """Overwrite the cell `below` rows under the first cell equal to `match`."""
+    wb = load_workbook(path)
+    ws = wb[sheet] if sheet else wb.worksheets[0]
+    cell = next(c for row in ws.iter_rows() for c in row if c.value == match)
+    ws.cell(row=cell.row + below, column=cell.column).value = value
+    wb.save(path)
+
+
+def drop_team(path, sheet, team):
+    wb = load_workbook(path)
+    ws = wb[sheet]
+    col = [c.value for c in ws[1]].index("Team") + 1
+    for row in reversed(range(2, ws.max_row + 1)):
+        if ws.cell(row=row, column=col).value == team:
+            ws.delete_rows(row)
+    wb.save(path)
+
+
+def test_current_round_is_valid(round_dir):
+    report = export_validator.validate()
+    assert report["ok"]
+    assert report["errors"] == 0
+    assert "coverage" in report["checked"]
+
+
+def test_non_numeric_odds_are_an_error_and_the_failure_is_cached(round_dir, monkeypatch):
+    set_cell(round_data.EXPORT_FILE, None, "BookieOdds", "abc")
+    with pytest.raises(InvalidExport) as e:
+        round_data.load_round()
+    assert any(i["check"] == "dtypes" and i["value"] == "abc" for i in e.value.report["issues"])
+
+    # the same version isn't parsed again
+    monkeypatch.setattr(round_data, "read_workbook", lambda p: pytest.fail("re-parsed"))
+    with pytest.raises(InvalidExport):
+        round_data.load_round()
+
+
+def test_zero_odds_mean_unpriced(round_dir):
+    set_cell(round_data.EXPORT_FILE, None, "BookieOdds", 0)
+    assert export_validator.validate()["ok"]
+
+
+def test_missing_home_team_is_only_a_warning(round_dir):
+    home = next(iter(round_data.load_game_info().values()))["home"]
+    drop_team(round_data.SUMMARY_FILE, round_data.SHEET_VENUE, home)
+
+    overall, venue = round_data.load_stats()
+    assert home not in set(venue["Team"])
+    warnings = [i for i in round_data.validation(round_data.SUMMARY_FILE)["issues"]
+                if i["check"] == "coverage"]
+    assert [i["severity"] for i in warnings if i["value"] == home] == ["warning"]
+
+
+def test_stats_without_an_export_skip_coverage(round_dir):
+    os.remove(round_data.EXPORT_FILE)
+    round_data.load_stats()
+    assert "coverage" not in round_data.validation(round_data.SUMMARY_FILE)["checked"]
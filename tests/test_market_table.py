@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import round_data
+from market_table import MarketTable
+
+
+@pytest.fixture
+def table():
+    return MarketTable.from_frame(pd.DataFrame({
+        "Game":   ["A VS B"] * 4 + ["C VS D"] * 2,
+        "Market": ["Anytime Goalscorer", "Anytime Goalscorer", "15+ Disposals", "15+ Disposals",
+                   "Anytime Goalscorer", "15+ Disposals"],
+        "Player": ["P1", "P2", "P3", "P4", "P5", "P6"],
+        "Odds":   [1.5, 2.5, 3.5, np.nan, 6.0, 1.2],
+        "Edge %": [10.0, -5.0, 20.0, 3.0, 1.0, 7.0],
+    }), cats=["Game", "Market", "Player"], nums=["Odds", "Edge %"])
+
+
+def test_no_market_filter_keeps_everything(table):
+    assert len(round_data.filter_markets(table)) == 6
+
+
+def test_empty_market_selection_is_an_empty_table(table):
+    assert round_data.filter_markets(table, markets=[]).empty
+
+
+def test_filter_and_sort(table):
+    best = round_data.filter_markets(table, markets=["Anytime Goalscorer"], odds_range=(1.0, 5.0))
+    assert list(best["Player"]) == ["P1", "P2"]
+    best = round_data.filter_markets(table, min_edge=5.0, top=2)
+    assert list(best["Player"]) == ["P3", "P1"]
+
+
+def test_game_slices_are_views(table):
+    game = table.game("A VS B")
+    assert len(game) == 4 and np.shares_memory(game.values, table.values)
+    assert len(table.game("nope")) == 0
+
+
+def test_unknown_item_matches_nothing(table):
+    assert not table.eq("Market", "Nope").any()
+
+
+def test_codes_widen_past_int16():
+    n = 40_000
+    big = MarketTable.from_frame(pd.DataFrame({"Player": [f"P{i}" for i in range(n)], "Odds": 2.0}),
+                                 cats=["Player"], nums=["Odds"])
+    assert big.codes.dtype == np.int32
+    assert big.cat("Player")[-1] == f"P{n - 1}"
@@ -0,0 +1,65 @@
+import logging
+
+import numpy as np
+
+import memcache
+import round_data
+from memcache import MemoryCache
+
+
+def test_least_recently_used_goes_first_when_over_budget():
+    c = MemoryCache("t_lru", max_mb=1)
+    block = lambda: np.zeros(300_000, dtype=np.uint8)       # ~0.3MB each
+    for k in "abc":
+        c.put(k, block())
+    c.get("a")                                              # a is now the most recent
+    c.put("d", block())
+    assert c.get("b") is None
+    assert all(c.get(k) is not None for k in "acd")
+    assert c.bytes <= c.max_bytes and c.evictions == 1
+
+
+def test_oversize_entries_are_returned_uncached():
+    c = MemoryCache("t_big", max_mb=0.1)
+    value = c.put("x", np.zeros(200_000, dtype=np.uint8))
+    assert len(value) == 200_000 and c.get("x") is None and c.oversize == 1
+
+
+def test_ttl_and_validity():
+    c = MemoryCache("t_ttl", ttl=0)
+    c.put("k", 1)
+    assert c.get("k") is None and c.expired == 1
+
+    c = MemoryCache("t_valid")
+    c.put("k", ("v1", "data"))
+    assert c.get("k", valid=lambda h: h[0] == "v2") is None
+    assert len(c) == 0
+
+
+def test_memoize():
+    c = MemoryCache("t_memo")
+    calls = []
+
+    @c.memoize
+    def square(x):
+        calls.append(x)
+        return x * x
+    assert [square(3), square(3), square(4)] == [9, 9, 16]
+    assert calls == [3, 4]
+    assert c.stats()["hits"] == 1
+
+
+def test_logging_is_left_to_the_app():
+    log = logging.getLogger("memcache")
+    assert memcache.log is log
+    assert log.propagate and not log.handlers
+
+
+def test_round_data_hits_do_not_take_the_parse_lock(round_dir, monkeypatch):
+    assert round_data.cached("h", "Export.xlsx", lambda p: "built") == "built"
+
+    class NoLocks(dict):
+        def __missing__(self, key):
+            raise AssertionError("a hit took the per-workbook lock")
+    monkeypatch.setattr(round_data, "_locks", NoLocks())
+    assert round_data.cached("h", "Export.xlsx", lambda p: "rebuilt") == "built"
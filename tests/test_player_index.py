@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from player_index import PlayerIndex, normalise
+
+
+def rows(game, players, market="Anytime Goalscorer"):
+    return pd.DataFrame({"Game": game, "Market": market, "Side": "home",
+                         "Row": range(len(players)), "Player": players})
+
+
+@pytest.fixture
+def index():
+    idx = PlayerIndex()
+    idx.update(pd.concat([
+        rows("Carlton VS Essendon", ["Patrick Cripps", "Jack Crisp", "Tom De Koning"]),
+        rows("Hawthorn VS Geelong", ["Tom de Koning", "Hudson O'Keeffe", "Jai Newcombe"]),
+    ]), version=1)
+    return idx
+
+
+def test_normalise():
+    assert normalise(" Hudson O'Keeffe ") == "hudson okeeffe"
+    assert normalise("Zoë  Smith") == "zoe smith"
+
+
+def test_prefix_on_any_name_token(index):
+    assert index.search("crip") == ["Patrick Cripps"]
+    assert index.search("okee") == ["Hudson O'Keeffe"]
+
+
+def test_fuzzy_surname_typo(index):
+    assert index.search("crips")[:2] == ["Patrick Cripps", "Jack Crisp"]
+
+
+def test_fuzzy_typo_in_the_first_letter(index):
+    assert index.search("krisp")[0] == "Jack Crisp"
+
+
+def test_spellings_across_games(index):
+    assert index.spellings("tom de koning") == ["Tom De Koning", "Tom de Koning"]
+    assert [g for g, *_ in index.entries("Tom de Koning")] == ["Carlton VS Essendon", "Hawthorn VS Geelong"]
+
+
+def test_update_drops_removed_games_and_same_version_is_a_no_op(index):
+    index.update(rows("Hawthorn VS Geelong", ["Tom de Koning", "Jai Newcombe"]), version=1)
+    assert index.search("cripps") == ["Patrick Cripps"]          # same version: untouched
+
+    index.update(rows("Hawthorn VS Geelong", ["Tom de Koning", "Jai Newcombe"]), version=2)
+    assert index.search("cripps") == []
+    assert index.spellings("tom de koning") == ["Tom de Koning"]
+    assert index.search("okeeffe") == []
@@ -0,0 +1,70 @@
+import os
+import pickle
+
+import pytest
+
+import round_data
+
+
+def touch(path, seconds=1):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + seconds * 10**9))
+
+
+def test_built_once_per_version(round_dir):
+    calls = []
+    build = lambda p: calls.append(p) or len(calls)
+    assert round_data.cached("t", "Export.xlsx", build) == 1
+    assert round_data.cached("t", "Export.xlsx", build) == 1
+    touch("Export.xlsx")
+    assert round_data.cached("t", "Export.xlsx", build) == 2
+
+
+def test_a_dependency_changing_rebuilds(round_dir):
+    calls = []
+    build = lambda p: calls.append(p) or len(calls)
+    kw = dict(depends=[os.path.abspath("Export_simple.xlsx")])
+    assert round_data.cached("t", "Export.xlsx", build, **kw) == 1
+    assert round_data.cached("t", "Export.xlsx", build, **kw) == 1
+    touch("Export_simple.xlsx")
+    assert round_data.cached("t", "Export.xlsx", build, **kw) == 2
+
+
+def test_failed_build_is_cached_for_the_version(round_dir):
+    calls = []
+
+    def build(p):
+        calls.append(p)
+        raise ValueError("half-written")
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            round_data.cached("t", "Export.xlsx", build)
+    assert len(calls) == 1
+    touch("Export.xlsx")
+    with pytest.raises(ValueError):
+        round_data.cached("t", "Export.xlsx", build)
+    assert len(calls) == 2
+
+
+def test_disk_cache_is_shared_but_keyed_on_the_build_version(round_dir):
+    round_data.cached("d", "Export.xlsx", lambda p: "first", disk=True, salt=1)
+    round_data._cache.clear()          # another process: only the disk copy is there
+    assert round_data.cached("d", "Export.xlsx", lambda p: "second", disk=True, salt=1) == "first"
+
+    # a pickle from an older build (e.g. from before validation) isn't reused
+    round_data._cache.clear()
+    assert round_data.cached("d", "Export.xlsx", lambda p: "third", disk=True, salt=2) == "third"
+
+
+def test_stats_pickle_from_before_validation_is_revalidated(round_dir):
+    path = os.path.abspath(round_data.SUMMARY_FILE)
+    export = os.path.abspath(round_data.EXPORT_FILE)
+    # what an unsalted build wrote to disk: no validation report behind it
+    version = (round_data.workbook_version(path), round_data.workbook_version(export))
+    os.makedirs(round_data.CACHE_DIR, exist_ok=True)
+    with open(round_data._disk_path("stats", path, version), "wb") as f:
+        pickle.dump(("stale", "stale"), f)
+
+    overall, venue = round_data.load_stats()
+    assert not isinstance(overall, str)
+    assert round_data.validation(path)["ok"]
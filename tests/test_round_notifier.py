@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import bulk_sender
+import round_data
+import round_notifier
+from bulk_sender import FakeTransport
+
+
+@pytest.fixture
+def run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)                 # send logs land in tmp_path/send_logs
+    monkeypatch.setattr(round_data, "CACHE_DIR", "")
+    monkeypatch.setattr(bulk_sender.time, "sleep", lambda s: None)
+    snapshot = str(tmp_path / "notifier" / "last.pkl")
+
+    def run(transport):
+        return round_notifier.run_once(["a@x.com", "b@x.com"], transport=transport,
+                                       export_file=os.path.join(ROOT, round_data.EXPORT_FILE),
+                                       snapshot_file=snapshot)
+    return run
+
+
+def test_failed_recipients_get_the_digest_on_the_next_run(run, capsys):
+    first = FakeTransport(fail={"b@x.com": 100})
+    assert run(first) is not None
+    assert [r for r, _, _ in first.sent] == ["a@x.com"]
+
+    # snapshot not saved: the same digest again, only to whoever missed it
+    second = FakeTransport()
+    assert run(second) is not None
+    assert [r for r, _, _ in second.sent] == ["b@x.com"]
+    assert second.sent[0][1:] == first.sent[0][1:]
+
+    # everyone has it now – nothing new until the export changes
+    assert run(FakeTransport()) is None
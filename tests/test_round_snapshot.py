@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pytest
+
+import round_data
+import round_snapshot
+from round_snapshot import SourceChanged
+
+
+@pytest.fixture
+def root(round_dir, monkeypatch):
+    monkeypatch.setattr(round_snapshot, "_current", {})
+    return str(round_dir / "snap")
+
+
+def test_published_round_matches_the_workbooks(root):
+    name = round_snapshot.publish(root)
+    assert name and round_snapshot.publish(root) is None      # unchanged: nothing to do
+
+    snap = round_snapshot.current(root)
+    fixtures, markets = round_data.load_round(snapshot=False)
+    assert snap.fixtures == fixtures
+    cols = ["Game", "Market", "Player"]
+    assert snap.markets[cols].astype(str).sort_values(cols).values.tolist() == \
+        markets[cols].astype(str).sort_values(cols).values.tolist()
+
+    # per-game slices are views of the mapped arrays, not copies
+    game = next(iter(fixtures))
+    assert np.shares_memory(snap.table.game(game).values, snap.table.values)
+
+
+def test_pruned_version_rereads_the_pointer(root, monkeypatch):
+    round_snapshot.publish(root)
+    real = round_snapshot.Snapshot
+    calls = []
+
+    def pruned_once(path):
+        calls.append(path)
+        if len(calls) == 1:
+            raise FileNotFoundError(path)     # removed between reading CURRENT and opening it
+        return real(path)
+    monkeypatch.setattr(round_snapshot, "Snapshot", pruned_once)
+    assert round_snapshot.current(root) is not None
+    assert len(calls) == 2
+
+
+def test_workbook_changing_mid_publish_is_not_published(root, monkeypatch):
+    first = round_snapshot.publish(root)
+    st = os.stat(round_data.EXPORT_FILE)
+    os.utime(round_data.EXPORT_FILE, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    real = round_data.load_market_table
+
+    def reexported(*a, **kw):
+        out = real(*a, **kw)
+        os.utime(round_data.EXPORT_FILE, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10**9))
+        return out
+    monkeypatch.setattr(round_data, "load_market_table", reexported)
+    with pytest.raises(SourceChanged):
+        round_snapshot.publish(root)
+    assert round_snapshot.current(root).version == first
+
+
+def test_invalid_round_keeps_the_last_good_version(root):
+    from openpyxl import load_workbook
+    from export_validator import InvalidExport
+
+    first = round_snapshot.publish(root)
+    wb = load_workbook(round_data.EXPORT_FILE)
+    ws = wb.worksheets[0]
+    cell = next(c for row in ws.iter_rows() for c in row if c.value == "BookieOdds")
+    ws.cell(row=cell.row + 1, column=cell.column).value = "abc"
+    wb.save(round_data.EXPORT_FILE)
+
+    with pytest.raises(InvalidExport):
+        round_snapshot.publish(root)
+    assert round_snapshot.current(root).version == first
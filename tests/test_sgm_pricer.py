@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import sgm_pricer
+
+
+def block(team, players, fair, odds):
+    return pd.DataFrame({"Team": team, "Player": players, "FairOdds": fair, "BookieOdds": odds})
+
+
+@pytest.fixture
+def legs():
+    # a Josh Smith on each side, plus Cripps in two nested goal markets
+    return sgm_pricer.legs_from_blocks({
+        "Anytime Goalscorer": (block("Carlton", ["Josh Smith", "Patrick Cripps"], [2.0, 3.0], [2.2, 3.5]),
+                               block("Essendon", ["Josh Smith"], [2.5], [2.6])),
+        "2+ Goalscorer":      (block("Carlton", ["Patrick Cripps"], [8.0], [9.0]),
+                               block("Essendon", [], [], [])),
+        "20+ Disposals":      (block("Carlton", ["Patrick Cripps"], [1.5], [1.6]),
+                               block("Essendon", [], [], [])),
+    })
+
+
+def test_namesakes_on_opposite_teams_are_two_players(legs):
+    smiths = legs[legs["Player"] == "Josh Smith"]
+    assert sorted(smiths["Leg"]) == ["Josh Smith (Carlton) Anytime Goalscorer",
+                                     "Josh Smith (Essendon) Anytime Goalscorer"]
+    assert legs["Leg"].is_unique
+    assert "Patrick Cripps Anytime Goalscorer" in set(legs["Leg"])    # no team when unambiguous
+
+    # both can be in one multi, correlated as opponents
+    pairs = {tuple(sorted(legs["Leg"][list(c)])) for c in sgm_pricer.candidate_combos(legs, 2)}
+    assert tuple(sorted(smiths["Leg"])) in pairs
+    latents = legs[["Team", "Player", "Side", "Family"]].drop_duplicates().reset_index(drop=True)
+    C = sgm_pricer.latent_correlation(latents)
+    at = {(t, p, f): i for i, (t, p, f) in enumerate(zip(latents["Team"], latents["Player"], latents["Family"]))}
+    assert C[at["Carlton", "Josh Smith", "goals"], at["Essendon", "Josh Smith", "goals"]] == \
+        pytest.approx(sgm_pricer.RHO_OPPONENTS)
+
+def test_nested_lines_of_one_player_never_share_a_multi(legs):
+    for combo in sgm_pricer.candidate_combos(legs, 2):
+        names = set(legs["Leg"][list(combo)])
+        assert names != {"Patrick Cripps Anytime Goalscorer", "Patrick Cripps 2+ Goalscorer"}
+
+
+def test_independent_legs_multiply(legs):
+    zero = dict(rho_same_player=0, rho_teammates=0, rho_opponents=0, rho_cross_family=0)
+    priced = sgm_pricer.price_multis(legs, max_legs=2, n_sims=200_000, seed=1, **zero)
+    probs = dict(zip(legs["Leg"], legs["Prob"]))
+    for _, r in priced.iterrows():
+        a, b = r["Legs"].split(" + ")
+        assert r["Prob"] == pytest.approx(probs[a] * probs[b], abs=0.01)
+
+
+def test_positive_correlation_lifts_the_joint_probability(legs):
+    same = legs[legs["Player"] == "Patrick Cripps"].iloc[[0, 2]].reset_index(drop=True)
+    assert set(same["Family"]) == {"goals", "disposals"}
+    indep = sgm_pricer.price_multis(same, n_sims=100_000, seed=2, rho_same_player=0)
+    corr = sgm_pricer.price_multis(same, n_sims=100_000, seed=2, rho_same_player=0.6)
+    assert corr["Prob"].iloc[0] > indep["Prob"].iloc[0] + 0.02
+
+
+def test_offered_prices():
+    legs = sgm_pricer.legs_from_blocks({
+        "Anytime Goalscorer": (block("Carlton", ["A", "B"], [2.0, 2.0], [2.0, 2.0]),
+                               block("Essendon", [], [], [])),
+    })
+    priced = sgm_pricer.price_multis(legs, offered={("A Anytime Goalscorer", "B Anytime Goalscorer"): 5.0},
+                                     n_sims=10_000, seed=3)
+    assert list(priced["Offered"]) == [5.0]
+    assert np.isfinite(priced["Edge %"]).all()
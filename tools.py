@@ -1,6 +1,15 @@
+import startup_profile
+startup_profile.start("tools")
+
 import streamlit as st
 import base64
-import pandas as pd
+# pandas is only needed for the Kelly table – imported there
+
+startup_profile.mark("imports")
+
+# Each calculator is an st.fragment: moving one of its sliders reruns only
+# that calculator, so the CSS, header and tool picker aren't rebuilt and
+# re-sent on every tick – the page itself only reruns when the tool changes.
 
 # ----------------------------------------------------
 # 1. Page Setup
@@ -12,10 +21,18 @@ st.set_page_config(
 )
 
 # ----------------------------------------------------
-# 2. Load and encode logo
+# 2. Load and encode logo (once per process)
 # ----------------------------------------------------
-with open("logo.png", "rb") as image_file:
-    encoded_logo = base64.b64encode(image_file.read()).decode()
+@st.cache_resource
+def header_html():
+    with open("logo.png", "rb") as image_file:
+        encoded_logo = base64.b64encode(image_file.read()).decode()
+    return f"""
+    <div style="display: flex; align-items: center; margin-bottom: 1rem;">
+        <img src="data:image/png;base64,{encoded_logo}" width="120" style="margin-right: 20px;">
+        <h1 style="margin: 0;">Betting Tools</h1>
+    </div>
+"""
 
 # ----------------------------------------------------
 # 3. Styling
@@ -41,12 +58,7 @@ st.markdown("""
 # ----------------------------------------------------
 # 4. Header with logo
 # ----------------------------------------------------
-st.markdown(f"""
-    <div style="display: flex; align-items: center; margin-bottom: 1rem;">
-        <img src="data:image/png;base64,{encoded_logo}" width="120" style="margin-right: 20px;">
-        <h1 style="margin: 0;">Betting Tools</h1>
-    </div>
-""", unsafe_allow_html=True)
+st.markdown(header_html(), unsafe_allow_html=True)
 
 # ----------------------------------------------------
 # 5. Tool Selector
@@ -57,7 +69,19 @@ st.markdown("---")
 # ----------------------------------------------------
 # 6. EV Calculator
 # ----------------------------------------------------
-if tool == "EV Calculator":
+def kelly_table(odds, prob_decimal):
+    # Kelly Table for $100 Bankroll – four rows, cheaper to build than to cache
+    import pandas as pd
+    kelly_data = []
+    for k in [0.1, 0.25, 0.5, 1.0]:
+        edge = (odds * prob_decimal - 1)
+        full_kelly = edge / (odds - 1) * 100
+        suggested = max(0, full_kelly * k)
+        kelly_data.append([f"{int(k*100)}%", f"${suggested:.2f}"])
+    return pd.DataFrame(kelly_data, columns=["Kelly Fraction", "Suggested Stake"])
+
+@st.fragment
+def ev_calculator():
     input_mode = st.radio("How do you estimate the chance of winning?", ["Probability (%)", "Fair Odds"], horizontal=True)
     odds = st.slider("Bookie Odds", min_value=1.01, max_value=20.0, value=2.00, step=0.05)
 
@@ -85,24 +109,15 @@ if tool == "EV Calculator":
 
     st.caption("Note: This tool assumes fixed odds and no commission.")
 
-    # Kelly Table for $100 Bankroll
     st.markdown("---")
     st.subheader("Kelly Table (based on $100 Bankroll)")
-
-    kelly_data = []
-    for k in [0.1, 0.25, 0.5, 1.0]:
-        edge = (odds * prob_decimal - 1)
-        full_kelly = edge / (odds - 1) * 100
-        suggested = max(0, full_kelly * k)
-        kelly_data.append([f"{int(k*100)}%", f"${suggested:.2f}"])
-
-    df_kelly = pd.DataFrame(kelly_data, columns=["Kelly Fraction", "Suggested Stake"])
-    st.table(df_kelly)
+    st.table(kelly_table(odds, prob_decimal))
 
 # ----------------------------------------------------
 # 7. Staking Tool (Standalone Kelly)
 # ----------------------------------------------------
-elif tool == "Staking Tool":
+@st.fragment
+def staking_tool():
     odds = st.number_input("Bookie Odds", min_value=1.01, max_value=100.0, value=2.0, step=0.01)
     prob = st.slider("Your Estimated Probability (%)", 0, 100, 50) / 100
     bankroll = st.number_input("Your Bankroll ($)", min_value=1.0, value=100.0)
@@ -118,5 +133,13 @@ elif tool == "Staking Tool":
 # ----------------------------------------------------
 # 8. Betfair Back/Lay Calculator
 # ----------------------------------------------------
-elif tool == "Betfair Calculator":
+def betfair_calculator():
     st.info("🛠️ Coming soon — back and lay calculator with implied % and commission adjustments.")
+
+{
+    "EV Calculator": ev_calculator,
+    "Staking Tool": staking_tool,
+    "Betfair Calculator": betfair_calculator,
+}[tool]()
+
+startup_profile.finish()